@@ -19,36 +19,53 @@ Environment variables (or .env file):
 """
 
 import asyncio
+import base64
+import dataclasses
 import io
-import json
 import logging
-import os
 import signal
 import sys
-import tempfile
-from datetime import datetime, timezone
+import time
 from pathlib import Path
-from typing import Optional
+from typing import List, NamedTuple, Optional
 
 import httpx
+import orjson
 from PIL import Image
 
-from config import get_client_settings, ClientSettings
+try:
+    import numpy as np
+    from turbojpeg import TurboJPEG, TJPF_RGB, TJFLAG_FASTDCT
+    _TJ = TurboJPEG()
+except Exception:  # PyTurboJPEG or libjpeg-turbo not installed
+    _TJ = None
+
+try:
+    # HTTP/2 support for httpx (optional) - only helps when the server sits
+    # behind an HTTP/2-capable TLS proxy; uvicorn itself speaks HTTP/1.1
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:  # h2 not installed
+    _HTTP2 = False
+
+from config import get_client_settings, FrozenClientSettings
 from wayland_utils import (
     detect_compositor,
-    get_active_class_name,
-    get_active_window_title,
-    capture_screenshot,
-    get_media_status,
-    get_microphone_status,
+    collect_metadata,
+    get_all_status,
+    capture_screenshot_async,
+    capture_screenshot_jpeg_async,
+    get_output_layout_width,
     send_notification,
-    check_required_tools
+    check_required_tools,
+    watch_media_status,
+    watch_microphone_status
 )
 
 logger = logging.getLogger("companion-client")
 
 
-def configure_logging(settings: ClientSettings, verbose: bool) -> None:
+def configure_logging(settings: FrozenClientSettings, verbose: bool) -> None:
     """Configure logging using client settings."""
     log_level = logging.DEBUG if verbose else getattr(
         logging,
@@ -75,6 +92,52 @@ def configure_logging(settings: ClientSettings, verbose: bool) -> None:
     )
 
 
+# Hamming distance below which two screenshots count as unchanged
+DHASH_THRESHOLD = 3
+
+# Seconds to let queued captures reach the server on shutdown
+SHUTDOWN_FLUSH_TIMEOUT = 10.0
+
+
+class Capture(NamedTuple):
+    """One capture cycle's output, queued for sending."""
+    metadata: dict
+    screenshot: Optional[bytes]
+    image_hash: Optional[int]
+
+
+def dhash(jpeg_data: bytes) -> Optional[int]:
+    """
+    64-bit difference hash of a JPEG screenshot.
+    
+    Uses JPEG draft mode, so the decode runs at 1/8 scale and costs little.
+    """
+    try:
+        with Image.open(io.BytesIO(jpeg_data)) as img:
+            img.draft("L", (72, 64))
+            pixels = list(img.convert("L").resize((9, 8), Image.Resampling.BILINEAR).getdata())
+    except Exception as e:
+        logger.debug(f"Could not hash screenshot: {e}")
+        return None
+    
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            bits = (bits << 1) | (left > pixels[row * 9 + col + 1])
+    return bits
+
+
+def utc_timestamp() -> str:
+    """Current time as an RFC 3339 UTC string, formatted without datetime."""
+    now = time.time()
+    t = time.gmtime(now)
+    return (
+        f"{t.tm_year:04}-{t.tm_mon:02}-{t.tm_mday:02}"
+        f"T{t.tm_hour:02}:{t.tm_min:02}:{t.tm_sec:02}.{int(now % 1 * 1_000_000):06}Z"
+    )
+
+
 class CompanionClient:
     """
     Wayland-native AI Desktop Companion client.
@@ -83,28 +146,61 @@ class CompanionClient:
     with the server for AI-powered feedback.
     """
     
-    def __init__(self, settings: Optional[ClientSettings] = None, verbose: bool = False):
+    def __init__(self, settings: Optional[FrozenClientSettings] = None, verbose: bool = False):
         """Initialize the companion client."""
         self.settings = settings or get_client_settings()
+        
+        # Plain attributes for settings read on every capture cycle
+        s = self.settings
+        self._cap_interval = s.capture_interval
+        self._jpeg_q = s.jpeg_quality
+        self._max_w = s.max_image_width
+        self._hq_resize = s.high_quality_resize
+        self._notif_timeout = s.notification_timeout
+        self._suppress_meeting = s.suppress_when_meeting
+        self._show_notif = s.show_notifications
+        self._batch_size = s.batch_size
+        self._batch_max_age = s.batch_max_age
+        
+        # Captures waiting to be sent as one batch
+        self._pending: List[Capture] = []
+        self._pending_since = 0.0
+        
+        # Idle-cycle detection: context of the last successful send
+        self._force_capture_every = s.force_capture_every
+        self._last_context_sig: tuple = ()
+        self._last_hash: Optional[int] = None
+        self._skipped_captures = 0
         self.compositor = detect_compositor()
         self.running = False
         self._shutdown_event = asyncio.Event()
         self.verbose = verbose
         self.capture_count = 0
+        self.tools: dict = {}
 
         configure_logging(self.settings, verbose)
         
         # HTTP client configuration
         self.http_client: Optional[httpx.AsyncClient] = None
         
+        # Long-running desktop event watchers, cancelled in cleanup()
+        self._watchers: List[asyncio.Task] = []
+        
+        # grim scale factor, resolved lazily from the output layout
+        self._capture_scale: Optional[float] = None
+        self._capture_scale_resolved = False
+        
+        # JPEG encode buffer for the PIL fallback path (one encode at a time)
+        self._jpeg_buf = io.BytesIO()
+        
         logger.info(f"Initialized client for {self.compositor.value} compositor")
     
     async def start(self) -> None:
         """Start the companion client main loop."""
         logger.info("Starting Wayland AI Desktop Companion client...")
         
-        # Check required tools
-        tools = check_required_tools()
+        # Check required tools (once per session)
+        self.tools = tools = check_required_tools()
         missing_critical = []
         
         if not tools["grim"]["available"]:
@@ -123,53 +219,159 @@ class CompanionClient:
             logger.debug(f"  {status} {tool}: {info['description']}")
         
         # Initialize HTTP client with configurable timeout for slow CPU inference
-        ssl_context = self._get_ssl_context()
-        self.http_client = httpx.AsyncClient(
-            timeout=float(self.settings.request_timeout),
-            verify=ssl_context
-        )
+        self.http_client = self._make_http_client()
         
         self.running = True
         
+        # Follow media/mic state instead of polling playerctl/wpctl every capture
+        if tools["playerctl"]["available"]:
+            self._watchers.append(asyncio.create_task(watch_media_status()))
+        if tools["pactl"]["available"]:
+            self._watchers.append(asyncio.create_task(watch_microphone_status()))
+        
         # Set up signal handlers
+        loop = asyncio.get_running_loop()
         for sig in (signal.SIGINT, signal.SIGTERM):
-            asyncio.get_event_loop().add_signal_handler(
+            loop.add_signal_handler(
                 sig,
                 lambda: asyncio.create_task(self.shutdown())
             )
         
-        logger.info(f"Client started. Capture interval: {self.settings.capture_interval}s")
+        logger.info(f"Client started. Capture interval: {self._cap_interval}s")
         logger.info(f"Server: {self.settings.server_url}")
         
         # Initial notification
-        if self.settings.show_notifications:
+        if self._show_notif:
             send_notification(
                 "AI Companion Started",
-                f"Monitoring desktop activity every {self.settings.capture_interval}s",
+                f"Monitoring desktop activity every {self._cap_interval}s",
                 urgency="low"
             )
         
-        # Main loop
+        # Pipeline: capture the next screenshot while the previous upload
+        # is still in flight
+        queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+        producer = asyncio.create_task(self._capture_loop(queue))
+        consumer = asyncio.create_task(self._send_loop(queue))
+        
         try:
-            while self.running:
-                try:
-                    await self._capture_and_send()
-                except Exception as e:
-                    logger.error(f"Capture cycle error: {e}")
-                
-                # Wait for next interval or shutdown
-                try:
-                    await asyncio.wait_for(
-                        self._shutdown_event.wait(),
-                        timeout=self.settings.capture_interval
-                    )
-                    break  # Shutdown requested
-                except asyncio.TimeoutError:
-                    pass  # Normal timeout, continue loop
-                    
+            await producer
         finally:
+            await self._stop_send_loop(queue, consumer)
             await self.cleanup()
     
+    async def _stop_send_loop(self, queue: asyncio.Queue, consumer: asyncio.Task) -> None:
+        """
+        Let the consumer send what is still queued, then stop it.
+        
+        A None sentinel tells the consumer to flush its pending batch and
+        exit; if that takes longer than SHUTDOWN_FLUSH_TIMEOUT the consumer
+        is cancelled and the leftovers are dropped.
+        """
+        async def drain() -> None:
+            await queue.put(None)
+            await consumer
+        
+        try:
+            await asyncio.wait_for(drain(), timeout=SHUTDOWN_FLUSH_TIMEOUT)
+        except asyncio.TimeoutError:
+            logger.warning("Timed out sending queued captures on shutdown")
+        consumer.cancel()
+        await asyncio.gather(consumer, return_exceptions=True)
+        
+        unsent = len(self._pending)
+        self._pending = []
+        while not queue.empty():
+            if queue.get_nowait() is not None:
+                unsent += 1
+        if unsent:
+            logger.debug(f"Dropping {unsent} unsent capture(s)")
+    
+    async def _capture_loop(self, queue: asyncio.Queue) -> None:
+        """Producer: capture context + screenshot every interval."""
+        # Absolute monotonic deadlines so capture time doesn't add drift
+        deadline = time.monotonic()
+        while self.running:
+            try:
+                capture = await self._capture()
+                if capture is not None:
+                    if queue.full():
+                        # Server is lagging behind - the newest capture wins
+                        queue.get_nowait()
+                        logger.debug("Send queue full, dropped oldest capture")
+                    queue.put_nowait(capture)
+            except Exception as e:
+                logger.error(f"Capture cycle error: {e}")
+            
+            deadline += self._cap_interval
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                # Cycle overran the interval - restart the schedule instead of catching up
+                deadline = time.monotonic()
+                remaining = 0
+            
+            # Wait for next interval or shutdown
+            try:
+                await asyncio.wait_for(
+                    self._shutdown_event.wait(),
+                    timeout=remaining
+                )
+                break  # Shutdown requested
+            except asyncio.TimeoutError:
+                pass  # Normal timeout, continue loop
+    
+    async def _send_loop(self, queue: asyncio.Queue) -> None:
+        """Consumer: send queued captures to the server until a None sentinel."""
+        while True:
+            if self._pending:
+                # Don't let a partial batch wait forever while idle
+                # cycles are being skipped
+                timeout = self._pending_since + self._batch_max_age - time.monotonic()
+                try:
+                    capture = await asyncio.wait_for(queue.get(), timeout=max(timeout, 0))
+                except asyncio.TimeoutError:
+                    await self._flush_pending()
+                    continue
+            else:
+                capture = await queue.get()
+            
+            if capture is None:
+                await self._flush_pending()
+                return
+            
+            try:
+                if self._batch_size <= 1:
+                    response = await self._send_to_server(capture.metadata, capture.screenshot)
+                    if response:
+                        self._mark_sent(capture)
+                    self._handle_response(response)
+                    continue
+                
+                if not self._pending:
+                    self._pending_since = time.monotonic()
+                self._pending.append(capture)
+                if len(self._pending) >= self._batch_size:
+                    await self._flush_pending()
+            except Exception as e:
+                logger.error(f"Send cycle error: {e}")
+    
+    async def _flush_pending(self) -> None:
+        """Send buffered captures as one batch, even if it isn't full."""
+        if not self._pending:
+            return
+        
+        batch, self._pending = self._pending, []
+        try:
+            responses = await self._send_batch_to_server(batch)
+            if responses is None:
+                self._handle_response(None)
+            else:
+                self._mark_sent(batch[-1])
+            for response in responses or []:
+                self._handle_response(response)
+        except Exception as e:
+            logger.error(f"Send cycle error: {e}")
+    
     async def shutdown(self) -> None:
         """Signal the client to shut down."""
         logger.info("Shutdown requested...")
@@ -178,10 +380,34 @@ class CompanionClient:
     
     async def cleanup(self) -> None:
         """Clean up resources."""
+        for task in self._watchers:
+            task.cancel()
+        await asyncio.gather(*self._watchers, return_exceptions=True)
+        self._watchers.clear()
+        
         if self.http_client:
             await self.http_client.aclose()
         logger.info("Client stopped")
     
+    def _make_http_client(self) -> httpx.AsyncClient:
+        """
+        Create the HTTP client used for all server requests.
+        
+        Keep-alive outlives the capture interval so the TCP+TLS handshake
+        is paid once rather than on every capture.
+        """
+        return httpx.AsyncClient(
+            http2=_HTTP2,
+            timeout=float(self.settings.request_timeout),
+            verify=self._get_ssl_context(),
+            limits=httpx.Limits(
+                max_connections=4,
+                max_keepalive_connections=2,
+                keepalive_expiry=max(60.0, self.settings.capture_interval * 2)
+            ),
+            headers={"X-API-Key": self.settings.api_key}
+        )
+    
     def _get_ssl_context(self):
         """Get SSL context for HTTPS requests."""
         if not self.settings.verify_ssl:
@@ -194,21 +420,77 @@ class CompanionClient:
     
     async def _capture_and_send(self) -> None:
         """Capture screen and context, send to server."""
+        capture = await self._capture(force=True)
+        response = await self._send_to_server(capture.metadata, capture.screenshot)
+        self._handle_response(response)
+    
+    def _mark_sent(self, capture: Capture) -> None:
+        """Remember what the server has already seen, for idle-cycle skipping."""
+        metadata = capture.metadata
+        self._last_context_sig = (
+            metadata["window_title"],
+            metadata["class_name"],
+            metadata["media_status"],
+            metadata["microphone_status"],
+        )
+        if capture.image_hash is not None:
+            self._last_hash = capture.image_hash
+    
+    async def _capture(self, force: bool = False) -> Optional[Capture]:
+        """
+        Capture screen and context for one cycle.
+        
+        Returns None when the context is unchanged since the last
+        successful send (no screenshot taken), or when the same window
+        shows a screenshot perceptually identical to the last one sent.
+        After `force_capture_every` skipped cycles in a row the next capture
+        is forced through as a heartbeat; `force` does the same right away.
+        """
+        
+        # Gather context
+        window_title, class_name, media_status, media_info, mic_status = (
+            await collect_metadata(self.compositor)
+        )
         
-        # Get microphone status first (for meeting detection)
-        mic_status = get_microphone_status()
+        # Unmuted mic means a possible meeting
         is_in_meeting = mic_status == "unmuted"
         
-        if is_in_meeting and self.settings.suppress_when_meeting:
+        if is_in_meeting and self._suppress_meeting:
             logger.debug("Mic unmuted (possible meeting), capture continues but notifications suppressed")
         
-        # Gather context
-        window_title = get_active_window_title(self.compositor)
-        class_name = get_active_class_name(self.compositor)
-        media_status, media_info = get_media_status()
+        # Too many skipped cycles in a row - send this one regardless
+        forced = force or self._skipped_captures >= self._force_capture_every
+        
+        # Nothing changed since the last send - skip the screenshot and upload
+        sig = (window_title, class_name, media_status, mic_status)
+        if (
+            not forced
+            and not is_in_meeting
+            and sig == self._last_context_sig
+        ):
+            self._skipped_captures += 1
+            logger.debug(f"Context unchanged, skipping capture ({self._skipped_captures}/{self._force_capture_every})")
+            return None
         
         # Capture screenshot
         screenshot_data = await self._capture_screenshot()
+        image_hash = dhash(screenshot_data) if screenshot_data else None
+        
+        # Same window showing the same pixels as the last upload - not
+        # worth another inference
+        if (
+            not forced
+            and not is_in_meeting
+            and sig[:2] == self._last_context_sig[:2]
+            and image_hash is not None
+            and self._last_hash is not None
+            and (image_hash ^ self._last_hash).bit_count() < DHASH_THRESHOLD
+        ):
+            self._skipped_captures += 1
+            logger.debug(f"Screenshot unchanged, skipping upload ({self._skipped_captures}/{self._force_capture_every})")
+            return None
+        
+        self._skipped_captures = 0
         
         # Prepare metadata
         metadata = {
@@ -218,7 +500,7 @@ class CompanionClient:
             "media_info": media_info,
             "microphone_status": mic_status,
             "user_status": "in_meeting" if is_in_meeting else "active",
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": utc_timestamp(),
             "compositor": self.compositor.value
         }
         
@@ -229,9 +511,10 @@ class CompanionClient:
             logger.info(f"  Media: {media_status}" + (f" ({media_info})" if media_info else ""))
             logger.info(f"  Mic: {mic_status} | Status: {'IN_MEETING' if is_in_meeting else 'ACTIVE'}")
         
-        # Send to server
-        response = await self._send_to_server(metadata, screenshot_data)
-        
+        return Capture(metadata, screenshot_data, image_hash)
+    
+    def _handle_response(self, response: Optional[dict]) -> None:
+        """Log the server response and notify the user."""
         if response:
             feedback = response.get("feedback", "")
             persona = response.get("persona_used", "Assistant")
@@ -250,54 +533,84 @@ class CompanionClient:
                 logger.info(f"  → {persona}: {feedback[:80]}{'...' if len(feedback) > 80 else ''}")
             
             # Send notification unless suppressed
-            if feedback and self.settings.show_notifications and not suppress:
+            if feedback and self._show_notif and not suppress:
                 send_notification(
                     f"{persona}",
                     feedback,
                     urgency="low",
-                    timeout=self.settings.notification_timeout
+                    timeout=self._notif_timeout
                 )
         else:
             logger.warning("  → No response from server")
     
+    def _get_capture_scale(self) -> Optional[float]:
+        """Get (and cache) the grim scale factor that fits max_image_width."""
+        if not self._capture_scale_resolved:
+            self._capture_scale_resolved = True
+            layout_width = get_output_layout_width(self.compositor)
+            if layout_width:
+                self._capture_scale = min(1.0, self._max_w / layout_width)
+                logger.debug(f"Output layout width {layout_width}, capture scale {self._capture_scale:.4f}")
+            else:
+                logger.debug("Output layout unknown, falling back to PIL resize")
+        return self._capture_scale
+    
     async def _capture_screenshot(self) -> Optional[bytes]:
         """Capture and process screenshot."""
-        with tempfile.NamedTemporaryFile(suffix=".png", delete=False) as tmp:
-            tmp_path = tmp.name
+        # Fast path: let grim scale and encode the JPEG natively
+        scale = self._get_capture_scale()
+        if scale is not None:
+            screenshot = await capture_screenshot_jpeg_async(self._jpeg_q, scale)
+            if screenshot:
+                return screenshot
         
-        try:
-            # Capture with grim
-            if not capture_screenshot(tmp_path):
-                logger.warning("Screenshot capture failed")
-                return None
+        # Capture with grim
+        png_data = await capture_screenshot_async()
+        if not png_data:
+            logger.warning("Screenshot capture failed")
+            return None
+        
+        # Resize and encode on a worker thread to keep the event loop responsive
+        return await asyncio.to_thread(self._encode_sync, png_data)
+    
+    def _encode_sync(self, png_data: bytes) -> bytes:
+        """Load, resize and JPEG-encode a captured PNG (blocking)."""
+        with Image.open(io.BytesIO(png_data)) as img:
+            # Resize if too large
+            if img.width > self._max_w:
+                ratio = self._max_w / img.width
+                new_height = int(img.height * ratio)
+                img = img.resize(
+                    (self._max_w, new_height),
+                    Image.Resampling.LANCZOS
+                    if self._hq_resize
+                    else Image.Resampling.BILINEAR
+                )
             
-            # Load and process image
-            with Image.open(tmp_path) as img:
-                # Resize if too large
-                if img.width > self.settings.max_image_width:
-                    ratio = self.settings.max_image_width / img.width
-                    new_height = int(img.height * ratio)
-                    img = img.resize(
-                        (self.settings.max_image_width, new_height),
-                        Image.Resampling.LANCZOS
-                    )
-                
-                # Convert to JPEG for compression
-                buffer = io.BytesIO()
-                img.convert("RGB").save(
-                    buffer,
-                    format="JPEG",
-                    quality=self.settings.jpeg_quality,
-                    optimize=True
+            # grim usually produces RGB already; avoid a full-frame copy
+            if img.mode != "RGB":
+                img = img.convert("RGB")
+            
+            # Convert to JPEG for compression (libjpeg-turbo when available)
+            if _TJ is not None:
+                return _TJ.encode(
+                    np.asarray(img),
+                    quality=self._jpeg_q,
+                    pixel_format=TJPF_RGB,
+                    flags=TJFLAG_FASTDCT
                 )
-                return buffer.getvalue()
-                
-        finally:
-            # Clean up temp file
-            try:
-                os.unlink(tmp_path)
-            except:
-                pass
+            
+            # Reused across captures; getvalue() hands back an independent copy
+            buffer = self._jpeg_buf
+            buffer.seek(0)
+            buffer.truncate()
+            img.save(
+                buffer,
+                format="JPEG",
+                quality=self._jpeg_q,
+                optimize=self._hq_resize
+            )
+            return buffer.getvalue()
     
     async def _send_to_server(
         self,
@@ -310,25 +623,62 @@ class CompanionClient:
             return None
         
         try:
-            # Prepare multipart form data
-            files = {}
-            if screenshot:
-                files["image"] = ("screenshot.jpg", screenshot, "image/jpeg")
+            # Raw JPEG body with metadata in a header - no multipart encoding
+            headers = {
+                "X-Metadata": base64.b64encode(orjson.dumps(metadata)).decode(),
+                "Content-Type": "image/jpeg"
+            }
             
+            response = await self.http_client.post(
+                f"{self.settings.server_url}/api/v1/analyze/raw",
+                content=screenshot or b"",
+                headers=headers
+            )
+            
+            if response.status_code == 200:
+                result = orjson.loads(response.content)
+                return result
+            elif response.status_code == 401:
+                logger.error("Authentication failed - check API key")
+            else:
+                logger.error(f"Server error: {response.status_code} - {response.text}")
+                
+        except httpx.ConnectError:
+            logger.error(f"Cannot connect to server at {self.settings.server_url}")
+        except httpx.TimeoutException:
+            logger.error("Request to server timed out")
+        except Exception as e:
+            logger.error(f"Request failed: {e}")
+        
+        return None
+    
+    async def _send_batch_to_server(
+        self,
+        batch: List[Capture]
+    ) -> Optional[List[dict]]:
+        """Send several buffered captures to the server in one request."""
+        if not self.http_client:
+            logger.error("HTTP client not initialized")
+            return None
+        
+        try:
+            files = {
+                f"image_{i}": (f"screenshot_{i}.jpg", screenshot, "image/jpeg")
+                for i, (_, screenshot, _) in enumerate(batch)
+                if screenshot
+            }
             data = {
-                "metadata": json.dumps(metadata)
+                "metadata": orjson.dumps([capture.metadata for capture in batch]).decode()
             }
             
             response = await self.http_client.post(
-                f"{self.settings.server_url}/api/v1/analyze",
+                f"{self.settings.server_url}/api/v1/analyze/batch",
                 data=data,
-                files=files if files else None,
-                headers={"X-API-Key": self.settings.api_key}
+                files=files if files else None
             )
             
             if response.status_code == 200:
-                result = response.json()
-                return result
+                return orjson.loads(response.content)
             elif response.status_code == 401:
                 logger.error("Authentication failed - check API key")
             else:
@@ -346,10 +696,7 @@ class CompanionClient:
     async def health_check(self) -> bool:
         """Check server connectivity."""
         if not self.http_client:
-            self.http_client = httpx.AsyncClient(
-                timeout=float(self.settings.request_timeout),
-                verify=self._get_ssl_context()
-            )
+            self.http_client = self._make_http_client()
         
         try:
             response = await self.http_client.get(
@@ -357,7 +704,7 @@ class CompanionClient:
             )
             
             if response.status_code == 200:
-                data = response.json()
+                data = orjson.loads(response.content)
                 logger.info(f"Server status: {data.get('status')}")
                 logger.info(f"Ollama connected: {data.get('ollama_connected')}")
                 logger.info(f"Models: {data.get('models_available', [])}")
@@ -418,14 +765,9 @@ async def main():
         compositor = detect_compositor()
         print(f"\nDetected compositor: {compositor.value}")
         
-        window = get_active_window_title(compositor)
-        class_name = get_active_class_name(compositor)
+        window, class_name, media_status, media_info, mic = get_all_status(compositor)
         print(f"Current active window: {window} (Class: {class_name})")
-        
-        media_status, media_info = get_media_status()
         print(f"Media status: {media_status}" + (f" ({media_info})" if media_info else ""))
-        
-        mic = get_microphone_status()
         print(f"Microphone: {mic}")
         
         return
@@ -440,7 +782,7 @@ async def main():
     
     # Override interval if specified
     if args.interval:
-        settings.capture_interval = args.interval
+        settings = dataclasses.replace(settings, capture_interval=args.interval)
     
     client = CompanionClient(settings, verbose=args.verbose)
     
@@ -450,8 +792,7 @@ async def main():
     
     if args.once:
         # Single capture for testing
-        ssl_context = client._get_ssl_context()
-        client.http_client = httpx.AsyncClient(timeout=float(settings.request_timeout), verify=ssl_context)
+        client.http_client = client._make_http_client()
         try:
             await client._capture_and_send()
         finally:
@@ -3,6 +3,7 @@ Client configuration using Pydantic Settings.
 """
 from pydantic_settings import BaseSettings
 from pydantic import Field
+from dataclasses import dataclass
 from functools import lru_cache
 
 
@@ -39,6 +40,25 @@ class ClientSettings(BaseSettings):
         default=75,
         description="JPEG compression quality (1-100)"
     )
+    high_quality_resize: bool = Field(
+        default=False,
+        description="Use LANCZOS resize and optimized JPEG (slower)"
+    )
+    
+    batch_size: int = Field(
+        default=1,
+        description="Captures buffered per server request (1 = send immediately)"
+    )
+    
+    batch_max_age: int = Field(
+        default=300,
+        description="Send a partial batch once its oldest capture is this old (seconds)"
+    )
+    
+    force_capture_every: int = Field(
+        default=5,
+        description="Capture anyway after this many skipped unchanged cycles"
+    )
     
     # Behavior
     suppress_when_meeting: bool = Field(
@@ -72,7 +92,39 @@ class ClientSettings(BaseSettings):
         case_sensitive = False
 
 
+@dataclass(slots=True, frozen=True)
+class FrozenClientSettings:
+    """
+    Immutable runtime snapshot of ClientSettings.
+    
+    Pydantic is only used to parse and validate the environment; the
+    client reads settings through plain slot attributes.
+    """
+    server_url: str
+    api_key: str
+    verify_ssl: bool
+    ca_cert_path: str
+    capture_interval: int
+    max_image_width: int
+    jpeg_quality: int
+    high_quality_resize: bool
+    batch_size: int
+    batch_max_age: int
+    force_capture_every: int
+    suppress_when_meeting: bool
+    show_notifications: bool
+    notification_timeout: int
+    request_timeout: int
+    log_level: str
+    log_file: str
+    
+    @classmethod
+    def from_settings(cls, settings: ClientSettings) -> "FrozenClientSettings":
+        """Snapshot validated settings."""
+        return cls(**settings.model_dump())
+
+
 @lru_cache()
-def get_client_settings() -> ClientSettings:
+def get_client_settings() -> FrozenClientSettings:
     """Get cached client settings instance."""
-    return ClientSettings()
+    return FrozenClientSettings.from_settings(ClientSettings())
@@ -3,15 +3,131 @@ Wayland-native system utilities.
 Handles screenshots, window detection, media status, and more.
 Uses subprocess to call native Wayland tools.
 """
+import asyncio
 import subprocess
 import shutil
 import logging
 import os
-from typing import Optional, Tuple
+import re
+import socket
+import struct
+import threading
+import time
+from typing import List, NamedTuple, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from functools import lru_cache, wraps
+
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# First single-quoted string in gdbus output, e.g. (true, "'Window Title'")
+_GDBUS_STR_RE = re.compile(r"'([^']*)'")
+
+
+@lru_cache(maxsize=None)
+def _which(name: str) -> Optional[str]:
+    """Cached shutil.which - tool paths don't change while the client runs."""
+    return shutil.which(name)
+
+
+async def _run(cmd: List[str], timeout: float = 5) -> Tuple[int, bytes]:
+    """
+    Run a command without blocking the event loop.
+    
+    Returns:
+        Tuple of (returncode, raw stdout). Raises asyncio.TimeoutError after
+        killing the process if it doesn't finish in time.
+    """
+    proc = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return (proc.returncode, stdout)
+
+
+class _TTLCache:
+    """
+    Short-lived cache for external tool queries.
+    
+    Desktop state changes at human speed, so answers up to a second old are
+    fine and spare a fork+exec whenever several code paths ask for the same
+    thing in one poll.
+    """
+    
+    def __init__(self):
+        self._entries: dict = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def _lookup(self, key: tuple, ttl: float) -> Tuple[bool, object]:
+        entry = self._entries.get(key)
+        if entry is not None and time.monotonic() - entry[0] < ttl:
+            self.hits += 1
+            return (True, entry[1])
+        self.misses += 1
+        return (False, None)
+    
+    def put(self, key: tuple, value):
+        self._entries[key] = (time.monotonic(), value)
+        return value
+    
+    def get_or_compute(self, key: tuple, ttl: float, fn):
+        found, value = self._lookup(key, ttl)
+        return value if found else self.put(key, fn())
+    
+    async def get_or_compute_async(self, key: tuple, ttl: float, fn):
+        found, value = self._lookup(key, ttl)
+        return value if found else self.put(key, await fn())
+    
+    def invalidate(self, key: Optional[tuple] = None) -> None:
+        if key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(key, None)
+    
+    def cached(self, key: tuple, ttl: float):
+        """Decorator for zero-argument (sync or async) query functions."""
+        def decorator(fn):
+            if asyncio.iscoroutinefunction(fn):
+                @wraps(fn)
+                async def async_wrapper():
+                    return await self.get_or_compute_async(key, ttl, fn)
+                return async_wrapper
+            
+            @wraps(fn)
+            def wrapper():
+                return self.get_or_compute(key, ttl, fn)
+            return wrapper
+        return decorator
+
+
+_STATUS_TTL = 1.0
+_tool_cache = _TTLCache()
+
+
+def get_tool_cache_stats() -> dict:
+    """Hit/miss counters of the external tool query cache."""
+    return {"hits": _tool_cache.hits, "misses": _tool_cache.misses}
+
+
+def invalidate_tool_cache(key: Optional[tuple] = None) -> None:
+    """
+    Drop cached tool answers, e.g. when an event says they are stale.
+    
+    Args:
+        key: One of ("media",), ("mic",), ("window", compositor); None clears all
+    """
+    _tool_cache.invalidate(key)
+
 
 class Compositor(Enum):
     """Supported Wayland compositors."""
@@ -27,22 +143,41 @@ def detect_compositor() -> Compositor:
     """
     Detect the running Wayland compositor.
     
+    The result is memoized on the relevant environment variables, so
+    repeated calls don't fall through to pgrep every poll.
+    
     Returns:
         Compositor enum value
     """
-    # Check environment variables
-    xdg_session = os.environ.get("XDG_CURRENT_DESKTOP", "").lower()
-    wayland_display = os.environ.get("WAYLAND_DISPLAY", "")
-    
+    return _detect_compositor_impl(
+        os.environ.get("XDG_CURRENT_DESKTOP", "").lower(),
+        os.environ.get("WAYLAND_DISPLAY", ""),
+        os.environ.get("HYPRLAND_INSTANCE_SIGNATURE", ""),
+        os.environ.get("SWAYSOCK", ""),
+    )
+
+
+def invalidate_compositor_cache() -> None:
+    """Forget the memoized compositor (e.g. after switching sessions)."""
+    _detect_compositor_impl.cache_clear()
+
+
+@lru_cache(maxsize=8)
+def _detect_compositor_impl(
+    xdg_session: str,
+    wayland_display: str,
+    hyprland_signature: str,
+    swaysock: str,
+) -> Compositor:
     if not wayland_display:
         logger.warning("WAYLAND_DISPLAY not set - may not be running on Wayland")
     
     # Check for Hyprland
-    if os.environ.get("HYPRLAND_INSTANCE_SIGNATURE"):
+    if hyprland_signature:
         return Compositor.HYPRLAND
     
     # Check for Sway
-    if os.environ.get("SWAYSOCK"):
+    if swaysock:
         return Compositor.SWAY
     
     # Check XDG_CURRENT_DESKTOP
@@ -56,31 +191,34 @@ def detect_compositor() -> Compositor:
         return Compositor.GNOME
     
     # Try to detect by checking running processes
-    try:
-        result = subprocess.run(
-            ["pgrep", "-x", "Hyprland"],
-            capture_output=True,
-            timeout=2
-        )
-        if result.returncode == 0:
-            return Compositor.HYPRLAND
-    except:
-        pass
+    if _find_process("Hyprland"):
+        return Compositor.HYPRLAND
     
-    try:
-        result = subprocess.run(
-            ["pgrep", "-x", "sway"],
-            capture_output=True,
-            timeout=2
-        )
-        if result.returncode == 0:
-            return Compositor.SWAY
-    except:
-        pass
+    if _find_process("sway"):
+        return Compositor.SWAY
     
     return Compositor.UNKNOWN
 
 
+def _find_process(name: str) -> bool:
+    """Check whether a process with this exact comm name is running (like `pgrep -x`)."""
+    try:
+        pids = [entry for entry in os.listdir("/proc") if entry.isdigit()]
+    except OSError:
+        return False
+    
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/comm") as f:
+                if f.read().rstrip("\n") == name:
+                    return True
+        except OSError:
+            # Process exited while we were scanning
+            continue
+    
+    return False
+
+
 def get_active_window_title(compositor: Optional[Compositor] = None) -> str:
     """
     Get the active window title using compositor-specific methods.
@@ -163,44 +301,211 @@ def get_active_class_name(compositor: Optional[Compositor] = None) -> str:
         logger.error(f"Failed to get window title: {e}")
         return "Unknown"
 
-def _get_hyprland_window_class() -> str:
-    """Get active window class from Hyprland."""
-    result = subprocess.run(
-        ["hyprctl", "activewindow", "-j"], capture_output=True, text=True, timeout=5
+def get_active_window_info(compositor: Optional[Compositor] = None) -> Tuple[str, str]:
+    """
+    Get the active window title and class with as few compositor queries as possible.
+    
+    Hyprland and Sway return both fields from a single IPC call; other
+    compositors fall back to the individual lookups.
+    
+    Args:
+        compositor: The compositor to use (auto-detected if None)
+        
+    Returns:
+        Tuple of (title, class_name), "Unknown" for fields that cannot be detected
+    """
+    if compositor is None:
+        compositor = detect_compositor()
+    
+    try:
+        if compositor == Compositor.HYPRLAND:
+            return _get_hyprland_window_info()
+        elif compositor == Compositor.SWAY:
+            return _get_sway_window_info()
+    except Exception as e:
+        logger.error(f"Failed to get window info: {e}")
+        return ("Unknown", "Unknown")
+    
+    return (get_active_window_title(compositor), get_active_class_name(compositor))
+
+
+async def get_active_window_info_async(compositor: Optional[Compositor] = None) -> Tuple[str, str]:
+    """Async variant of get_active_window_info()."""
+    if compositor is None:
+        compositor = detect_compositor()
+    
+    try:
+        if compositor == Compositor.HYPRLAND:
+            return await _get_hyprland_window_info_async()
+        elif compositor == Compositor.SWAY:
+            return await _get_sway_window_info_async()
+    except Exception as e:
+        logger.error(f"Failed to get window info: {e}")
+        return ("Unknown", "Unknown")
+    
+    # KWin/GNOME lookups are several sequential calls - keep them off the loop
+    return await _tool_cache.get_or_compute_async(
+        ("window", compositor), _STATUS_TTL,
+        lambda: asyncio.to_thread(get_active_window_info, compositor)
     )
 
-    if result.returncode == 0:
-        import json
 
-        data = json.loads(result.stdout)
-        return data.get("class", "Unknown") or data.get("initialClass", "Unknown")
+def _parse_hyprland_window(output: bytes) -> Tuple[str, str]:
+    """Extract (title, class) from `hyprctl activewindow -j` output."""
+    data = orjson.loads(output)
+    title = data.get("title") or data.get("class") or "Unknown"
+    class_name = data.get("class") or data.get("initialClass") or "Unknown"
+    return (title, class_name)
 
-    return "Unknown"
 
+def _find_focused(root: dict) -> Optional[dict]:
+    """Depth-first search of a sway tree for the focused node."""
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if node.get("focused"):
+            return node
+        stack.extend(node.get("nodes", ()))
+        stack.extend(node.get("floating_nodes", ()))
+    return None
 
-def _get_sway_window_class() -> str:
-    """Get active window class from Sway."""
+
+def _parse_sway_window(output: bytes) -> Tuple[str, str]:
+    """Extract (title, class) of the focused node from `swaymsg -t get_tree` output."""
+    focused = _find_focused(orjson.loads(output))
+    if focused:
+        return (focused.get("name") or "Unknown", focused.get("class") or "Unknown")
+    
+    return ("Unknown", "Unknown")
+
+
+# Title and class lookups within the TTL share one compositor query
+@_tool_cache.cached(("window", Compositor.HYPRLAND), _STATUS_TTL)
+def _get_hyprland_window_info() -> Tuple[str, str]:
+    """Get active window title and class from a single Hyprland query."""
     result = subprocess.run(
-        ["swaymsg", "-t", "get_tree"], capture_output=True, text=True, timeout=5
+        ["hyprctl", "activewindow", "-j"], capture_output=True, timeout=5
     )
-
+    
     if result.returncode == 0:
-        import json
-
-        def find_focused(node):
-            if node.get("focused"):
-                return node.get("class", "Unknown")
-            for child in node.get("nodes", []) + node.get("floating_nodes", []):
-                result = find_focused(child)
-                if result:
-                    return result
+        return _parse_hyprland_window(result.stdout)
+    
+    return ("Unknown", "Unknown")
+
+
+@_tool_cache.cached(("window", Compositor.HYPRLAND), _STATUS_TTL)
+async def _get_hyprland_window_info_async() -> Tuple[str, str]:
+    returncode, stdout = await _run(["hyprctl", "activewindow", "-j"])
+    return _parse_hyprland_window(stdout) if returncode == 0 else ("Unknown", "Unknown")
+
+
+# sway IPC (i3-ipc) message types, see sway-ipc(7)
+_SWAY_IPC_MAGIC = b"i3-ipc"
+_SWAY_IPC_HEADER = struct.Struct("=6sII")
+_SWAY_GET_OUTPUTS = 3
+_SWAY_GET_TREE = 4
+
+
+class _SwayIPC:
+    """
+    Persistent connection to sway's IPC socket ($SWAYSOCK).
+    
+    Talks the i3-ipc framing directly, so a query is one socket round trip
+    instead of a swaymsg fork+exec.
+    """
+    
+    def __init__(self):
+        self._sock: Optional[socket.socket] = None
+        self._lock = threading.Lock()
+    
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+    
+    def _recv_exact(self, size: int) -> bytes:
+        buf = bytearray()
+        while len(buf) < size:
+            chunk = self._sock.recv(size - len(buf))
+            if not chunk:
+                raise ConnectionError("sway IPC socket closed")
+            buf += chunk
+        return bytes(buf)
+    
+    def _roundtrip(self, path: str, msg_type: int) -> bytes:
+        if self._sock is None:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.settimeout(5)
+            self._sock.connect(path)
+        
+        self._sock.sendall(_SWAY_IPC_HEADER.pack(_SWAY_IPC_MAGIC, 0, msg_type))
+        magic, length, _ = _SWAY_IPC_HEADER.unpack(self._recv_exact(_SWAY_IPC_HEADER.size))
+        if magic != _SWAY_IPC_MAGIC:
+            raise ConnectionError("Unexpected sway IPC reply")
+        return self._recv_exact(length)
+    
+    def query(self, msg_type: int) -> Optional[bytes]:
+        """
+        Send a payload-less request and return the raw JSON reply.
+        
+        Returns:
+            Reply bytes, or None if sway's socket is unavailable
+        """
+        path = os.environ.get("SWAYSOCK")
+        if not path:
+            return None
+        
+        with self._lock:
+            # Retry once on a fresh connection in case sway was restarted
+            for _ in range(2):
+                try:
+                    return self._roundtrip(path, msg_type)
+                except OSError as e:
+                    self.close()
+                    error = e
+            logger.debug(f"sway IPC query failed: {error}")
             return None
 
-        tree = json.loads(result.stdout)
-        title = find_focused(tree)
-        return title or "Unknown"
 
-    return "Unknown"
+_sway_ipc = _SwayIPC()
+
+
+def _sway_query(msg_type: int, swaymsg_type: str) -> Optional[bytes]:
+    """Query sway over its IPC socket, falling back to swaymsg."""
+    payload = _sway_ipc.query(msg_type)
+    if payload is not None:
+        return payload
+    
+    result = subprocess.run(
+        ["swaymsg", "-t", swaymsg_type], capture_output=True, timeout=5
+    )
+    return result.stdout if result.returncode == 0 else None
+
+
+@_tool_cache.cached(("window", Compositor.SWAY), _STATUS_TTL)
+def _get_sway_window_info() -> Tuple[str, str]:
+    """Get active window title and class from a single Sway tree walk."""
+    tree = _sway_query(_SWAY_GET_TREE, "get_tree")
+    return _parse_sway_window(tree) if tree else ("Unknown", "Unknown")
+
+
+@_tool_cache.cached(("window", Compositor.SWAY), _STATUS_TTL)
+async def _get_sway_window_info_async() -> Tuple[str, str]:
+    tree = await asyncio.to_thread(_sway_ipc.query, _SWAY_GET_TREE)
+    if tree is None:
+        returncode, stdout = await _run(["swaymsg", "-t", "get_tree"])
+        tree = stdout if returncode == 0 else None
+    return _parse_sway_window(tree) if tree else ("Unknown", "Unknown")
+
+
+def _get_hyprland_window_class() -> str:
+    """Get active window class from Hyprland."""
+    return _get_hyprland_window_info()[1]
+
+
+def _get_sway_window_class() -> str:
+    """Get active window class from Sway."""
+    return _get_sway_window_info()[1]
 
 
 def _get_kwin_window_class() -> str:
@@ -217,7 +522,7 @@ def _get_kwin_window_class() -> str:
         return result.stdout.strip()
 
     # Alternative: use kdotool if available
-    if shutil.which("kdotool"):
+    if _which("kdotool"):
         result = subprocess.run(
             ["kdotool", "getactivewindow", "getwindowclass"],
             capture_output=True,
@@ -259,9 +564,7 @@ def _get_gnome_window_class() -> str:
         # Parse the gdbus output format: (true, "'Window Title'")
         output = result.stdout.strip()
         if "true" in output:
-            import re
-
-            match = re.search(r"'([^']*)'", output)
+            match = _GDBUS_STR_RE.search(output)
             if match:
                 return match.group(1)
 
@@ -270,47 +573,12 @@ def _get_gnome_window_class() -> str:
 
 def _get_hyprland_window_title() -> str:
     """Get active window title from Hyprland."""
-    result = subprocess.run(
-        ["hyprctl", "activewindow", "-j"],
-        capture_output=True,
-        text=True,
-        timeout=5
-    )
-    
-    if result.returncode == 0:
-        import json
-        data = json.loads(result.stdout)
-        return data.get("title", "Unknown") or data.get("class", "Unknown")
-    
-    return "Unknown"
+    return _get_hyprland_window_info()[0]
 
 
 def _get_sway_window_title() -> str:
     """Get active window title from Sway."""
-    result = subprocess.run(
-        ["swaymsg", "-t", "get_tree"],
-        capture_output=True,
-        text=True,
-        timeout=5
-    )
-    
-    if result.returncode == 0:
-        import json
-        
-        def find_focused(node):
-            if node.get("focused"):
-                return node.get("name", "Unknown")
-            for child in node.get("nodes", []) + node.get("floating_nodes", []):
-                result = find_focused(child)
-                if result:
-                    return result
-            return None
-        
-        tree = json.loads(result.stdout)
-        title = find_focused(tree)
-        return title or "Unknown"
-    
-    return "Unknown"
+    return _get_sway_window_info()[0]
 
 
 def _get_kwin_window_title() -> str:
@@ -327,7 +595,7 @@ def _get_kwin_window_title() -> str:
         return result.stdout.strip()
     
     # Alternative: use kdotool if available
-    if shutil.which("kdotool"):
+    if _which("kdotool"):
         result = subprocess.run(
             ["kdotool", "getactivewindow", "getwindowname"],
             capture_output=True,
@@ -361,49 +629,243 @@ def _get_gnome_window_title() -> str:
         # Parse the gdbus output format: (true, "'Window Title'")
         output = result.stdout.strip()
         if "true" in output:
-            import re
-            match = re.search(r"'([^']*)'", output)
+            match = _GDBUS_STR_RE.search(output)
             if match:
                 return match.group(1)
     
     return "Unknown"
 
 
+def _run_grim(args: List[str]) -> Optional[bytes]:
+    """Run grim writing to stdout and return the encoded image bytes."""
+    if not _which("grim"):
+        logger.error("grim not found - please install it: pacman -S grim")
+        return None
+    
+    try:
+        result = subprocess.run(
+            ["grim", *args, "-"],
+            capture_output=True,
+            timeout=10
+        )
+        
+        if result.returncode == 0 and result.stdout:
+            return result.stdout
+        
+        logger.error(f"grim failed: {result.stderr.decode(errors='replace')}")
+        return None
+        
+    except subprocess.TimeoutExpired:
+        logger.error("Screenshot capture timed out")
+        return None
+    except Exception as e:
+        logger.error(f"Screenshot capture failed: {e}")
+        return None
+
+
+async def _run_grim_async(args: List[str]) -> Optional[bytes]:
+    """Async variant of _run_grim that doesn't block a thread while grim runs."""
+    if not _which("grim"):
+        logger.error("grim not found - please install it: pacman -S grim")
+        return None
+    
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            "grim", *args, "-",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        try:
+            stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=10)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            logger.error("Screenshot capture timed out")
+            return None
+        
+        if proc.returncode == 0 and stdout:
+            return stdout
+        
+        logger.error(f"grim failed: {stderr.decode(errors='replace')}")
+        return None
+        
+    except Exception as e:
+        logger.error(f"Screenshot capture failed: {e}")
+        return None
+
+
+def capture_screenshot_bytes() -> Optional[bytes]:
+    """
+    Capture a full-resolution PNG screenshot using grim (Wayland-native).
+    
+    grim writes to stdout, so the image never touches the filesystem.
+    
+    Returns:
+        PNG bytes, or None if capture failed
+    """
+    return _run_grim([])
+
+
 def capture_screenshot(output_path: str) -> bool:
     """
     Capture a screenshot using grim (Wayland-native).
     
+    Thin wrapper around capture_screenshot_bytes() for callers that need a
+    file; prefer a path under /dev/shm to keep the round trip in memory.
+    
     Args:
         output_path: Path to save the screenshot
         
     Returns:
         True if successful, False otherwise
     """
-    if not shutil.which("grim"):
-        logger.error("grim not found - please install it: pacman -S grim")
+    png_data = capture_screenshot_bytes()
+    if png_data is None:
         return False
     
     try:
-        result = subprocess.run(
-            ["grim", output_path],
-            capture_output=True,
-            text=True,
-            timeout=10
-        )
-        
-        if result.returncode == 0:
-            logger.debug(f"Screenshot saved to {output_path}")
-            return True
-        else:
-            logger.error(f"grim failed: {result.stderr}")
-            return False
-            
-    except subprocess.TimeoutExpired:
-        logger.error("Screenshot capture timed out")
+        with open(output_path, "wb") as f:
+            f.write(png_data)
+    except OSError as e:
+        logger.error(f"Failed to save screenshot: {e}")
         return False
+    
+    logger.debug(f"Screenshot saved to {output_path}")
+    return True
+
+
+def capture_screenshot_jpeg(quality: int, scale: float) -> Optional[bytes]:
+    """
+    Capture a pre-scaled JPEG screenshot using grim.
+    
+    Args:
+        quality: JPEG quality (1-100)
+        scale: Output scale factor applied by grim
+        
+    Returns:
+        JPEG bytes, or None if capture failed
+    """
+    return _run_grim(["-t", "jpeg", "-q", str(quality), "-s", f"{scale:.4f}"])
+
+
+async def capture_screenshot_async() -> Optional[bytes]:
+    """Async variant of capture_screenshot_bytes()."""
+    return await _run_grim_async([])
+
+
+async def capture_screenshot_jpeg_async(quality: int, scale: float) -> Optional[bytes]:
+    """Async variant of capture_screenshot_jpeg()."""
+    return await _run_grim_async(["-t", "jpeg", "-q", str(quality), "-s", f"{scale:.4f}"])
+
+
+def _layout_span(spans: List[Tuple[float, float]]) -> Optional[int]:
+    """Width covered by (x, width) output spans; x may be negative."""
+    if not spans:
+        return None
+    return int(max(x + w for x, w in spans) - min(x for x, _ in spans))
+
+
+def _hyprland_logical_width(monitor: dict) -> float:
+    """Logical width of a `hyprctl monitors -j` entry, after rotation and scale."""
+    # Odd transforms (90/270 degrees, flipped or not) swap width and height
+    width = monitor["height"] if monitor.get("transform", 0) % 2 else monitor["width"]
+    return width / (monitor.get("scale") or 1)
+
+
+def get_output_layout_width(compositor: Optional[Compositor] = None) -> Optional[int]:
+    """
+    Get the logical width of the combined output layout (what grim captures).
+    
+    Args:
+        compositor: The compositor to use (auto-detected if None)
+        
+    Returns:
+        Layout width in logical pixels, or None if it cannot be determined
+    """
+    if compositor is None:
+        compositor = detect_compositor()
+    
+    try:
+        if compositor == Compositor.HYPRLAND:
+            result = subprocess.run(
+                ["hyprctl", "monitors", "-j"],
+                capture_output=True,
+                timeout=5
+            )
+            if result.returncode == 0:
+                monitors = orjson.loads(result.stdout)
+                return _layout_span([
+                    (m["x"], _hyprland_logical_width(m))
+                    for m in monitors if not m.get("disabled")
+                ])
+        elif compositor == Compositor.SWAY:
+            payload = _sway_query(_SWAY_GET_OUTPUTS, "get_outputs")
+            if payload:
+                outputs = orjson.loads(payload)
+                return _layout_span([
+                    (o["rect"]["x"], o["rect"]["width"])
+                    for o in outputs if o.get("active")
+                ])
     except Exception as e:
-        logger.error(f"Screenshot capture failed: {e}")
-        return False
+        logger.error(f"Failed to get output layout: {e}")
+    
+    return None
+
+
+# Latest (status, info) from watch_media_status(); None while no watcher runs
+_MEDIA_STATE: Optional[Tuple[str, Optional[str]]] = None
+_MEDIA_FORMAT = "{{status}}|{{playerName}}|{{artist}} - {{title}}"
+
+
+def _parse_media_line(line: str) -> Tuple[str, Optional[str]]:
+    """Parse one line of `playerctl metadata --format _MEDIA_FORMAT` output."""
+    status, _, rest = line.strip().partition("|")
+    player, _, track = rest.partition("|")
+    
+    status = status.lower()
+    if status not in ["playing", "paused", "stopped"]:
+        return ("unknown", None)
+    
+    return (status, f"{player}: {track}" if status == "playing" else None)
+
+
+async def watch_media_status() -> None:
+    """
+    Keep _MEDIA_STATE current from a single `playerctl --follow` process.
+    
+    Runs until cancelled; restarts playerctl if it exits. While this is
+    running get_media_status() costs no subprocess at all.
+    """
+    global _MEDIA_STATE
+    
+    if not _which("playerctl"):
+        logger.warning("playerctl not found - media status unavailable")
+        return
+    
+    while True:
+        proc = None
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "playerctl", "--follow", "metadata", "--format", _MEDIA_FORMAT,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            # playerctl prints nothing until a player appears
+            _MEDIA_STATE = ("unknown", None)
+            async for line in proc.stdout:
+                _MEDIA_STATE = _parse_media_line(line.decode(errors="replace"))
+            logger.debug(f"playerctl --follow exited ({await proc.wait()}), restarting")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Media watcher failed: {e}")
+        finally:
+            _MEDIA_STATE = None
+            if proc and proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+        
+        await asyncio.sleep(5)
 
 
 def get_media_status() -> Tuple[str, Optional[str]]:
@@ -414,52 +876,78 @@ def get_media_status() -> Tuple[str, Optional[str]]:
         Tuple of (status, info) where status is 'playing'/'paused'/'stopped'/'unknown'
         and info is the current track info (e.g., "Artist - Title")
     """
-    if not shutil.which("playerctl"):
+    if _MEDIA_STATE is not None:
+        return _MEDIA_STATE
+    return _poll_media_status()
+
+
+@_tool_cache.cached(("media",), _STATUS_TTL)
+def _poll_media_status() -> Tuple[str, Optional[str]]:
+    if not _which("playerctl"):
         logger.warning("playerctl not found - media status unavailable")
         return ("unknown", None)
     
     try:
-        # Get status
-        status_result = subprocess.run(
-            ["playerctl", "status"],
+        # Status, player and track from a single invocation
+        result = subprocess.run(
+            ["playerctl", "metadata", "--format", _MEDIA_FORMAT],
             capture_output=True,
             text=True,
             timeout=5
         )
-        
-        status = status_result.stdout.strip().lower()
-        if status not in ["playing", "paused", "stopped"]:
-            status = "unknown"
-        
-        # Get metadata if playing
-        info = None
-        if status == "playing":
-            meta_result = subprocess.run(
-                ["playerctl", "metadata", "--format", "{{ artist }} - {{ title }}"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if meta_result.returncode == 0:
-                info = meta_result.stdout.strip()
-                # Also get player name
-                player_result = subprocess.run(
-                    ["playerctl", "metadata", "--format", "{{ playerName }}"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                if player_result.returncode == 0:
-                    player = player_result.stdout.strip()
-                    info = f"{player}: {info}"
-        
-        return (status, info)
+        return _parse_media_line(result.stdout)
         
     except Exception as e:
         logger.error(f"Failed to get media status: {e}")
         return ("unknown", None)
 
 
+# Latest mute state from watch_microphone_status(); None while no watcher runs
+_MIC_STATE: Optional[str] = None
+
+
+async def watch_microphone_status() -> None:
+    """
+    Keep _MIC_STATE current from a single `pactl subscribe` event stream.
+    
+    Mute state is re-queried only when PulseAudio/PipeWire reports a
+    source or server (default device) change. Runs until cancelled.
+    """
+    global _MIC_STATE
+    
+    if not _which("pactl"):
+        return
+    
+    while True:
+        proc = None
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "pactl", "subscribe",
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL
+            )
+            invalidate_tool_cache(("mic",))
+            _MIC_STATE = await _poll_microphone_status_async()
+            
+            # e.g. "Event 'change' on source #57"
+            async for line in proc.stdout:
+                if b" on source" in line or b" on server" in line:
+                    invalidate_tool_cache(("mic",))
+                    _MIC_STATE = await _poll_microphone_status_async()
+            logger.debug(f"pactl subscribe exited ({await proc.wait()}), restarting")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Microphone watcher failed: {e}")
+        finally:
+            _MIC_STATE = None
+            if proc and proc.returncode is None:
+                proc.kill()
+                await proc.wait()
+        
+        await asyncio.sleep(5)
+
+
 def get_microphone_status() -> str:
     """
     Get microphone mute status using pactl or wpctl.
@@ -467,48 +955,151 @@ def get_microphone_status() -> str:
     Returns:
         'muted', 'unmuted', or 'unknown'
     """
-    # Try wpctl first (PipeWire)
-    if shutil.which("wpctl"):
+    if _MIC_STATE is not None:
+        return _MIC_STATE
+    return _poll_microphone_status()
+
+
+def _parse_wpctl_mute(output: bytes) -> Optional[str]:
+    """Parse `wpctl get-volume` output, e.g. "Volume: 0.40 [MUTED]"."""
+    output = output.lower()
+    if b"[muted]" in output:
+        return "muted"
+    elif b"volume:" in output:
+        return "unmuted"
+    return None
+
+
+def _parse_pactl_mute(output: bytes) -> Optional[str]:
+    """Parse `pactl get-source-mute` output, e.g. "Mute: yes"."""
+    output = output.lower()
+    if b"yes" in output:
+        return "muted"
+    elif b"no" in output:
+        return "unmuted"
+    return None
+
+
+# Tried in order: wpctl (PipeWire) first, then pactl (PulseAudio)
+_MIC_QUERIES = (
+    (["wpctl", "get-volume", "@DEFAULT_SOURCE@"], _parse_wpctl_mute),
+    (["pactl", "get-source-mute", "@DEFAULT_SOURCE@"], _parse_pactl_mute),
+)
+
+
+@_tool_cache.cached(("mic",), _STATUS_TTL)
+def _poll_microphone_status() -> str:
+    for cmd, parse in _MIC_QUERIES:
+        if not _which(cmd[0]):
+            continue
         try:
-            result = subprocess.run(
-                ["wpctl", "get-volume", "@DEFAULT_SOURCE@"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                output = result.stdout.lower()
-                if "[muted]" in output:
-                    return "muted"
-                elif "volume:" in output:
-                    return "unmuted"
-        except:
+            result = subprocess.run(cmd, capture_output=True, timeout=5)
+            status = parse(result.stdout) if result.returncode == 0 else None
+            if status:
+                return status
+        except Exception:
             pass
     
-    # Fall back to pactl (PulseAudio)
-    if shutil.which("pactl"):
+    logger.warning("Could not determine microphone status")
+    return "unknown"
+
+
+async def get_media_status_async() -> Tuple[str, Optional[str]]:
+    """Async variant of get_media_status()."""
+    if _MEDIA_STATE is not None:
+        return _MEDIA_STATE
+    return await _poll_media_status_async()
+
+
+@_tool_cache.cached(("media",), _STATUS_TTL)
+async def _poll_media_status_async() -> Tuple[str, Optional[str]]:
+    if not _which("playerctl"):
+        logger.warning("playerctl not found - media status unavailable")
+        return ("unknown", None)
+    
+    try:
+        _, stdout = await _run(["playerctl", "metadata", "--format", _MEDIA_FORMAT])
+        return _parse_media_line(stdout.decode(errors="replace"))
+        
+    except Exception as e:
+        logger.error(f"Failed to get media status: {e}")
+        return ("unknown", None)
+
+
+async def get_microphone_status_async() -> str:
+    """Async variant of get_microphone_status()."""
+    if _MIC_STATE is not None:
+        return _MIC_STATE
+    return await _poll_microphone_status_async()
+
+
+@_tool_cache.cached(("mic",), _STATUS_TTL)
+async def _poll_microphone_status_async() -> str:
+    for cmd, parse in _MIC_QUERIES:
+        if not _which(cmd[0]):
+            continue
         try:
-            result = subprocess.run(
-                ["pactl", "get-source-mute", "@DEFAULT_SOURCE@"],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            
-            if result.returncode == 0:
-                output = result.stdout.lower()
-                if "yes" in output:
-                    return "muted"
-                elif "no" in output:
-                    return "unmuted"
-        except:
+            returncode, stdout = await _run(cmd)
+            status = parse(stdout) if returncode == 0 else None
+            if status:
+                return status
+        except Exception:
             pass
     
     logger.warning("Could not determine microphone status")
     return "unknown"
 
 
+class DesktopState(NamedTuple):
+    """Snapshot of the desktop context sent alongside each screenshot."""
+    window_title: str
+    class_name: str
+    media_status: str
+    media_info: Optional[str]
+    microphone_status: str
+
+
+async def collect_metadata(compositor: Optional[Compositor] = None) -> DesktopState:
+    """
+    Query window, media and microphone state concurrently.
+    
+    Args:
+        compositor: The compositor to use (auto-detected if None)
+        
+    Returns:
+        DesktopState; a poll costs the slowest query rather than the sum of all
+    """
+    (window_title, class_name), (media_status, media_info), mic_status = await asyncio.gather(
+        get_active_window_info_async(compositor),
+        get_media_status_async(),
+        get_microphone_status_async()
+    )
+    return DesktopState(window_title, class_name, media_status, media_info, mic_status)
+
+
+# Shared by get_all_status(); threads are only started on first use
+_status_executor = ThreadPoolExecutor(max_workers=3, thread_name_prefix="status")
+
+
+def get_all_status(compositor: Optional[Compositor] = None) -> DesktopState:
+    """
+    Synchronous counterpart of collect_metadata().
+    
+    Runs the window, media and microphone queries on a thread pool so the
+    call takes as long as the slowest query rather than their sum.
+    
+    Args:
+        compositor: The compositor to use (auto-detected if None)
+    """
+    window = _status_executor.submit(get_active_window_info, compositor)
+    media = _status_executor.submit(get_media_status)
+    mic = _status_executor.submit(get_microphone_status)
+    
+    window_title, class_name = window.result()
+    media_status, media_info = media.result()
+    return DesktopState(window_title, class_name, media_status, media_info, mic.result())
+
+
 def send_notification(
     title: str,
     body: str,
@@ -529,7 +1120,7 @@ def send_notification(
     Returns:
         True if successful
     """
-    if not shutil.which("notify-send"):
+    if not _which("notify-send"):
         logger.error("notify-send not found - please install libnotify")
         return False
     
@@ -546,7 +1137,12 @@ def send_notification(
         
         cmd.extend([title, body])
         
-        result = subprocess.run(cmd, capture_output=True, timeout=5)
+        result = subprocess.run(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            timeout=5
+        )
         return result.returncode == 0
         
     except Exception as e:
@@ -554,29 +1150,30 @@ def send_notification(
         return False
 
 
+# Tool name -> what the companion uses it for
+_TOOLS = {
+    "grim": "Screenshot capture",
+    "playerctl": "Media status",
+    "pactl": "PulseAudio mic status",
+    "wpctl": "PipeWire mic status",
+    "notify-send": "Desktop notifications",
+    "hyprctl": "Hyprland integration",
+    "swaymsg": "Sway integration",
+}
+
+
+@lru_cache(maxsize=1)
 def check_required_tools() -> dict:
     """
     Check which required tools are available.
     
+    The result is computed once; call check_required_tools.cache_clear()
+    after installing tools to re-check.
+    
     Returns:
         Dict with tool names as keys and availability as values
     """
-    tools = {
-        "grim": "Screenshot capture",
-        "playerctl": "Media status",
-        "pactl": "PulseAudio mic status",
-        "wpctl": "PipeWire mic status",
-        "notify-send": "Desktop notifications",
-        "hyprctl": "Hyprland integration",
-        "swaymsg": "Sway integration",
+    return {
+        tool: {"available": _which(tool) is not None, "description": description}
+        for tool, description in _TOOLS.items()
     }
-    
-    result = {}
-    for tool, description in tools.items():
-        available = shutil.which(tool) is not None
-        result[tool] = {
-            "available": available,
-            "description": description
-        }
-    
-    return result
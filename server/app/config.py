@@ -25,6 +25,11 @@ class Settings(BaseSettings):
     ollama_base_url: str = Field(default="http://ollama:11434", description="Ollama API base URL")
     vision_model: str = Field(default="moondream", description="Vision model for image analysis")
     reasoning_model: str = Field(default="llama3.2:1b", description="Reasoning model for feedback")
+    reasoning_num_ctx: int = Field(default=2048, description="Context window (tokens) for the reasoning model, 0 for the model default")
+    prompt_section_max_chars: int = Field(default=800, description="Max characters of history and of todos put into the reasoning prompt")
+    model_keep_alive: str = Field(default="30m", description="How long Ollama keeps models loaded after a request (\"0\" unloads immediately)")
+    ollama_max_inflight: int = Field(default=4, description="Max generate requests in flight on Ollama at once (match Ollama's OLLAMA_NUM_PARALLEL)")
+    embedding_model: str = Field(default="", description="Embedding model for the semantic feedback cache (empty disables)")
     
     # Context
     context_window_size: int = Field(default=10, description="Sliding window size for context")
@@ -32,9 +37,17 @@ class Settings(BaseSettings):
     todo_file_path: str = Field(default="/app/config/todo.txt", description="Path to todo.txt file")
     personas_file_path: str = Field(default="/app/config/personas.json", description="Path to personas.json")
     
+    background_feedback: bool = Field(default=False, description="Generate feedback in background workers and return it with the next /analyze response")
+    feedback_workers: int = Field(default=2, description="Background feedback workers (with background_feedback)")
+    
     # Performance
     max_image_width: int = Field(default=1024, description="Maximum image width")
     request_timeout: float = Field(default=300.0, description="Request timeout in seconds")
+    analyze_deadline: float = Field(default=0.0, description="Seconds an /analyze cycle may wait on Ollama before its remaining calls are dropped (0 disables; calls are still bounded by request_timeout)")
+    response_cache_size: int = Field(default=512, description="Max cached Ollama responses (0 disables)")
+    response_cache_ttl: float = Field(default=300.0, description="Seconds a cached Ollama response is reused")
+    semantic_cache_size: int = Field(default=256, description="Feedbacks kept for near-duplicate matching")
+    semantic_cache_threshold: float = Field(default=0.95, description="Cosine similarity needed to reuse a feedback")
     
     class Config:
         env_file = ".env"
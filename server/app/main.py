@@ -1,15 +1,18 @@
 """
 FastAPI application factory and main entry point.
 """
+import asyncio
 import logging
 import sys
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
 from app.routes import router
 from app.services.context import get_context_manager
+from app.services.ollama import get_ollama_service
 from app import __version__
 
 # Configure logging
@@ -41,10 +44,19 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.error(f"Failed to initialize context manager: {e}")
     
+    # Load models in the background; a cold model can take a while and
+    # requests are served (more slowly) in the meantime
+    warmup_task = asyncio.create_task(get_ollama_service().warmup())
+    
+    if settings.background_feedback:
+        get_ollama_service().start_feedback_workers(settings.feedback_workers)
+    
     yield
     
     # Shutdown
     logger.info("Shutting down Wayland AI Companion Server")
+    warmup_task.cancel()
+    await get_ollama_service().aclose()
 
 
 def create_app() -> FastAPI:
@@ -56,6 +68,7 @@ def create_app() -> FastAPI:
         description="A context-aware AI companion for Arch Linux / Wayland desktops",
         version=__version__,
         lifespan=lifespan,
+        default_response_class=ORJSONResponse,
         docs_url="/docs" if settings.debug else None,
         redoc_url="/redoc" if settings.debug else None,
     )
@@ -90,6 +103,8 @@ if __name__ == "__main__":
         port=settings.port,
         ssl_certfile=settings.ssl_certfile,
         ssl_keyfile=settings.ssl_keyfile,
+        loop="uvloop",
+        http="httptools",
         reload=settings.debug,
         log_level="debug" if settings.debug else "info"
     )
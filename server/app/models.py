@@ -1,12 +1,20 @@
 """
 Pydantic models for API request/response validation.
 """
-from pydantic import BaseModel, Field
-from typing import Optional, List, Dict
+from collections import deque
+from dataclasses import dataclass
+from functools import partial
+import orjson
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
+from typing import Deque, Optional, List, Dict
 from datetime import datetime, timezone
 from enum import Enum
 
 
+# Timezone-aware "now" for timestamp defaults, without a lambda frame per call
+_utcnow = partial(datetime.now, timezone.utc)
+
+
 class MicrophoneStatus(str, Enum):
     """Microphone status enum."""
     MUTED = "muted"
@@ -37,12 +45,22 @@ class ClientMetadata(BaseModel):
     media_info: Optional[str] = Field(default=None, description="e.g., 'Spotify - Song Name'")
     microphone_status: MicrophoneStatus = Field(default=MicrophoneStatus.UNKNOWN)
     user_status: UserStatus = Field(default=UserStatus.ACTIVE)
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    timestamp: datetime = Field(default_factory=_utcnow)
     compositor: Optional[str] = Field(default=None, description="Wayland compositor name")
 
 
-class ContextEntry(BaseModel):
-    """Single entry in the context sliding window."""
+# Number of recent entries included in ContextWindow.get_summary()
+SUMMARY_SIZE = 5
+
+
+@dataclass(slots=True, frozen=True)
+class ContextEntry:
+    """
+    Single entry in the context sliding window.
+    
+    Built server-side from already-validated metadata on every capture, so
+    it is a plain slotted dataclass rather than a validating model.
+    """
     timestamp: datetime
     window_title: str
     class_name: str
@@ -53,30 +71,54 @@ class ContextEntry(BaseModel):
 
 class ContextWindow(BaseModel):
     """Sliding window of recent context."""
-    entries: List[ContextEntry] = Field(default_factory=list)
+    entries: Deque[ContextEntry] = Field(default_factory=deque)
     max_size: int = Field(default=10)
     
+    # Summary lines of the last SUMMARY_SIZE entries, rendered on insert
+    _rendered: Deque[str] = PrivateAttr()
+    # Each entry serialized to JSON once, on insert, for the /context endpoint
+    _serialized: Deque[bytes] = PrivateAttr()
+    
+    @model_validator(mode="after")
+    def _bound_entries(self) -> "ContextWindow":
+        """Back entries with a bounded deque so eviction is O(1)."""
+        self.entries = deque(self.entries, maxlen=self.max_size)
+        return self
+    
+    def model_post_init(self, __context) -> None:
+        self._rendered = deque(
+            (self._render(e) for e in self.entries),
+            maxlen=min(SUMMARY_SIZE, self.max_size)
+        )
+        self._serialized = deque(map(orjson.dumps, self.entries), maxlen=self.max_size)
+    
+    @staticmethod
+    def _render(entry: ContextEntry) -> str:
+        time_str = entry.timestamp.strftime("%H:%M")
+        return f"[{time_str}] {entry.class_name}-{entry.window_title}: {entry.vision_summary or 'No visual summary'}"
+    
     def add_entry(self, entry: ContextEntry) -> None:
         """Add entry to window, removing oldest if full."""
         self.entries.append(entry)
-        if len(self.entries) > self.max_size:
-            self.entries.pop(0)
+        self._rendered.append(self._render(entry))
+        self._serialized.append(orjson.dumps(entry))
     
     def get_summary(self) -> str:
         """Get a text summary of recent context."""
-        if not self.entries:
+        if not self._rendered:
             return "No recent activity recorded."
         
-        summaries = []
-        for entry in self.entries[-5:]:  # Last 5 entries
-            time_str = entry.timestamp.strftime("%H:%M")
-            summaries.append(f"[{time_str}] {entry.class_name}-{entry.window_title}: {entry.vision_summary or 'No visual summary'}")
-        
-        return "\n".join(summaries)
+        return "\n".join(self._rendered)
+    
+    def entries_json(self) -> bytes:
+        """Get the entries as a JSON array, joined from pre-serialized entries."""
+        return b"[" + b",".join(self._serialized) + b"]"
 
 
 class Persona(BaseModel):
-    """AI persona configuration."""
+    """AI persona configuration (loaded once, read-only afterwards)."""
+    model_config = ConfigDict(frozen=True)
+    
     name: str
     short: str = Field(default="", description="Short display name for UI")
     icon: str = Field(default="󰚩", description="Nerd Font icon for UI")
@@ -106,7 +148,7 @@ class FeedbackResponse(BaseModel):
     context_summary: str
     user_status: UserStatus
     suppress_notification: bool = Field(default=False)
-    timestamp: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    timestamp: datetime = Field(default_factory=_utcnow)
 
 
 class HealthResponse(BaseModel):
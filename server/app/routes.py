@@ -2,13 +2,19 @@
 API routes for the companion server.
 """
 
+import asyncio
 import base64
-import json
 import logging
+import time
 from pathlib import Path
+from typing import AsyncIterator, List, Optional, Tuple
 
-import httpx
-from fastapi import APIRouter, Depends, UploadFile, File, Form, HTTPException
+import orjson
+from fastapi import APIRouter, Depends, UploadFile, File, Form, Header, HTTPException, Request
+from fastapi.responses import Response
+from pydantic import TypeAdapter
+from starlette.datastructures import UploadFile as StarletteUploadFile
+from starlette.formparsers import MultiPartParser
 
 from app.models import ClientMetadata, FeedbackResponse, HealthResponse, UserStatus, ModelsResponse, SwitchModelRequest, SwitchModelResponse
 from app.config import get_settings
@@ -17,10 +23,33 @@ from app.services.ollama import get_ollama_service
 from app.services.context import get_context_manager
 from app import __version__
 
+try:
+    # SIMD base64 (optional) - several times faster on multi-MB screenshots
+    from pybase64 import b64encode_as_string
+except ImportError:  # pybase64 not installed
+    def b64encode_as_string(data: bytes) -> str:
+        return base64.b64encode(data).decode("ascii")
+
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Parses and validates a JSON array of ClientMetadata in one pass
+_metadata_list_adapter = TypeAdapter(List[ClientMetadata])
+
+# Keep uploaded screenshots in memory. Starlette rolls uploads over 1MB
+# to a temp file, which costs a disk write and a read on every /analyze.
+MultiPartParser.spool_max_size = 16 * 1024 * 1024
+
+
+# Health results are reused for this long so monitoring pollers don't
+# turn into a steady stream of Ollama requests
+HEALTH_CACHE_TTL = 2.0
+
+# (monotonic timestamp, response) of the last Ollama health probe
+_health_cache: Optional[Tuple[float, HealthResponse]] = None
+_health_lock = asyncio.Lock()
+
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
@@ -28,16 +57,28 @@ async def health_check():
     Health check endpoint - no authentication required.
     Returns server status and Ollama connectivity.
     """
-    ollama = get_ollama_service()
-    connected = await ollama.check_connection()
-    models = await ollama.list_models() if connected else []
-
-    return HealthResponse(
-        status="healthy" if connected else "degraded",
-        version=__version__,
-        ollama_connected=connected,
-        models_available=models,
-    )
+    global _health_cache
+
+    if _health_cache and time.monotonic() - _health_cache[0] < HEALTH_CACHE_TTL:
+        return _health_cache[1]
+
+    # One probe at a time; callers that waited get its result
+    async with _health_lock:
+        if _health_cache and time.monotonic() - _health_cache[0] < HEALTH_CACHE_TTL:
+            return _health_cache[1]
+
+        ollama = get_ollama_service()
+        connected = await ollama.check_connection()
+        models = await ollama.list_models() if connected else []
+
+        response = HealthResponse(
+            status="healthy" if connected else "degraded",
+            version=__version__,
+            ollama_connected=connected,
+            models_available=models,
+        )
+        _health_cache = (time.monotonic(), response)
+        return response
 
 
 @router.post("/analyze", response_model=FeedbackResponse)
@@ -54,39 +95,198 @@ async def analyze_activity(
     """
     # Parse metadata
     try:
-        meta_dict = json.loads(metadata)
-        client_metadata = ClientMetadata(**meta_dict)
+        client_metadata = ClientMetadata.model_validate_json(metadata)
     except Exception as e:
         logger.error(f"Invalid metadata: {e}")
         raise HTTPException(status_code=400, detail=f"Invalid metadata: {str(e)}")
 
-    # Get services
+    image_base64 = await _b64encode_upload(image) if image and image.size > 0 else None
+    return await _analyze(client_metadata, image_base64)
+
+
+@router.post("/analyze/raw", response_model=FeedbackResponse)
+async def analyze_activity_raw(
+    request: Request,
+    x_metadata: str = Header(..., description="Base64-encoded JSON ClientMetadata"),
+    _: str = Depends(verify_api_key),
+):
+    """
+    Same as /analyze, but the request body is the raw JPEG screenshot
+    (may be empty) and metadata travels in the X-Metadata header.
+
+    Avoids multipart encoding and boundary scanning on both ends.
+    """
+    try:
+        client_metadata = ClientMetadata.model_validate_json(
+            base64.b64decode(x_metadata, validate=True)
+        )
+    except Exception as e:
+        logger.error(f"Invalid metadata: {e}")
+        raise HTTPException(status_code=400, detail=f"Invalid metadata: {str(e)}")
+
+    image_base64 = await _b64encode_stream(request.stream())
+    return await _analyze(client_metadata, image_base64 or None)
+
+
+@router.post("/analyze/batch", response_model=List[FeedbackResponse])
+async def analyze_activity_batch(
+    request: Request,
+    metadata: str = Form(..., description="JSON array of ClientMetadata"),
+    _: str = Depends(verify_api_key),
+):
+    """
+    Analyze several buffered captures in one request.
+
+    Screenshots are sent as optional `image_0` ... `image_{K-1}` fields
+    matching the order of the metadata array. Captures are processed in
+    order so the context window sees them chronologically.
+    """
+    try:
+        batch = _metadata_list_adapter.validate_json(metadata)
+    except Exception as e:
+        logger.error(f"Invalid metadata: {e}")
+        raise HTTPException(status_code=400, detail=f"Invalid metadata: {str(e)}")
+
+    form = await request.form()
+    deadline = _analyze_deadline()
+
+    # Vision analyses fan out, bounded by the service's inflight limit;
+    # context and feedback are still processed capture by capture below
+    vision_tasks = []
+    for i, client_metadata in enumerate(batch):
+        image = form.get(f"image_{i}")
+        image_base64 = await _b64encode_upload(image) if isinstance(image, StarletteUploadFile) else None
+        vision_tasks.append(_start_vision(client_metadata, image_base64, deadline))
+
+    try:
+        return [
+            await _process(client_metadata, vision_task, deadline)
+            for client_metadata, vision_task in zip(batch, vision_tasks)
+        ]
+    finally:
+        for vision_task in vision_tasks:
+            if vision_task and not vision_task.done():
+                vision_task.cancel()
+
+
+# Multiple of 3 so every full chunk encodes without base64 padding
+_B64_CHUNK_SIZE = 3 * 64 * 1024
+
+
+async def _b64encode_stream(chunks: AsyncIterator[bytes]) -> str:
+    """
+    Base64-encode a byte stream chunk by chunk.
+
+    Only the encoded text and one chunk are held at a time, rather than
+    the raw upload plus its encoded copy.
+    """
+    parts = []
+    tail = b""
+    async for chunk in chunks:
+        if tail:
+            chunk = tail + chunk
+        cut = len(chunk) - len(chunk) % 3
+        if cut:
+            parts.append(b64encode_as_string(chunk[:cut]))
+        tail = chunk[cut:]
+    if tail:
+        parts.append(b64encode_as_string(tail))
+    return "".join(parts)
+
+
+async def _b64encode_upload(upload: UploadFile) -> str:
+    """Base64-encode an uploaded file without reading it into memory whole."""
+    async def chunks():
+        while chunk := await upload.read(_B64_CHUNK_SIZE):
+            yield chunk
+
+    return await _b64encode_stream(chunks())
+
+
+def _analyze_deadline() -> Optional[float]:
+    """
+    Get the time.monotonic() deadline for a capture's Ollama calls.
+
+    None when ANALYZE_DEADLINE is unset (0); the calls are then only
+    bounded by REQUEST_TIMEOUT.
+    """
+    budget = get_settings().analyze_deadline
+    return time.monotonic() + budget if budget > 0 else None
+
+
+async def _analyze(
+    client_metadata: ClientMetadata, image_base64: Optional[str]
+) -> FeedbackResponse:
+    """Run vision analysis, update the context window and generate feedback."""
+    # Results that arrive after this are dropped rather than waited on
+    deadline = _analyze_deadline()
+
+    # Start vision analysis first so the context/todo/persona work in
+    # _process overlaps with the model call instead of adding to it.
+    vision_task = _start_vision(client_metadata, image_base64, deadline)
+    return await _process(client_metadata, vision_task, deadline)
+
+
+def _start_vision(
+    client_metadata: ClientMetadata,
+    image_base64: Optional[str],
+    deadline: Optional[float],
+) -> Optional[asyncio.Task]:
+    """
+    Start vision analysis of a capture in the background.
+
+    Args:
+        client_metadata: Metadata of the capture
+        image_base64: Base64 encoded screenshot, if the capture has one
+        deadline: time.monotonic() after which the result is dropped, if any
+
+    Returns:
+        The running analysis, or None if there is no screenshot
+    """
+    if not image_base64:
+        return None
+
+    ollama = get_ollama_service()
+    context = f"window: {client_metadata.window_title}, whose application name is {client_metadata.class_name}"
+
+    return asyncio.create_task(
+        ollama.analyze_image(image_base64, context=context, deadline=deadline)
+    )
+
+
+async def _process(
+    client_metadata: ClientMetadata,
+    vision_task: Optional[asyncio.Task],
+    deadline: Optional[float],
+) -> FeedbackResponse:
+    """Wait for vision analysis, update the context window and generate feedback."""
     ollama = get_ollama_service()
-    context_mgr = await get_context_manager()
 
     # Determine if we should suppress notifications
     suppress_notification = client_metadata.user_status == UserStatus.IN_MEETING
 
-    # Process image if provided
-    vision_summary = None
-    if image and image.size > 0:
-        try:
-            image_data = await image.read()
-            image_base64 = base64.b64encode(image_data).decode("utf-8")
-
-            # Analyze with vision model
-            vision_summary = await ollama.analyze_image(
-                image_base64,
-                context=f"window: {client_metadata.window_title}, whose application name is {client_metadata.class_name}",
-            )
-            logger.info(
-                f"Vision analysis complete: {vision_summary if vision_summary else 'None'}..."
-            )
-        except Exception as e:
-            logger.error(f"Image processing error: {e}")
-            vision_summary = f"Could not analyze image: {str(e)}"
-    else:
-        vision_summary = f"User is in: {client_metadata.window_title}"
+    try:
+        context_mgr = await get_context_manager()
+        todo_text = context_mgr.get_todos_text()
+        persona_prompt = context_mgr.get_persona_prompt()
+
+        # Process image if provided
+        vision_summary = None
+        if vision_task:
+            try:
+                vision_summary = await vision_task
+                logger.info(
+                    f"Vision analysis complete: {vision_summary if vision_summary else 'None'}..."
+                )
+            except Exception as e:
+                logger.error(f"Image processing error: {e}")
+                vision_summary = f"Could not analyze image: {str(e)}"
+        else:
+            vision_summary = f"User is in: {client_metadata.window_title}"
+    finally:
+        # Don't leave the model call running if we bail out early
+        if vision_task and not vision_task.done():
+            vision_task.cancel()
 
     # Add to context window
     context_mgr.add_context_entry(
@@ -97,14 +297,13 @@ async def analyze_activity(
         vision_summary=vision_summary,
     )
 
-    # Get context and todos
+    # The summary includes the entry just added
     context_summary = context_mgr.get_context_summary()
-    todo_text = context_mgr.get_todos_text()
-    persona_prompt = context_mgr.get_persona_prompt()
 
     # Generate feedback only after enough captures (or if in meeting, suppress)
     feedback = ""
     should_generate = context_mgr.should_generate_feedback()
+    background_feedback = get_settings().background_feedback
 
     if suppress_notification:
         feedback = "[Notification suppressed - user in meeting]"
@@ -115,19 +314,28 @@ async def analyze_activity(
         logger.info(f"Accumulating context... {remaining} captures until feedback")
     else:
         # Generate feedback and reset counter
-        feedback = (
-            await ollama.generate_feedback(
-                vision_summary=vision_summary or "No visual data",
-                context_summary=context_summary,
-                todo_list=todo_text,
-                persona_prompt=persona_prompt,
-                user_status=client_metadata.user_status.value,
-                app_name=f"{client_metadata.class_name} ({client_metadata.window_title})",
-            )
-            or "Keep up the good work!"
+        feedback_request = dict(
+            vision_summary=vision_summary or "No visual data",
+            context_summary=context_summary,
+            todo_list=todo_text,
+            persona_prompt=persona_prompt,
+            user_status=client_metadata.user_status.value,
+            app_name=f"{client_metadata.class_name} ({client_metadata.window_title})",
+            deadline=deadline,
         )
+        if background_feedback:
+            # Delivered with a later response once a worker finishes it
+            ollama.submit_feedback(**feedback_request)
+        else:
+            feedback = (
+                await ollama.generate_feedback(**feedback_request)
+                or "Keep up the good work!"
+            )
         context_mgr.reset_capture_count()
 
+    if background_feedback and not suppress_notification:
+        feedback = ollama.take_feedback() or ""
+
     return FeedbackResponse(
         feedback=feedback,
         persona_used=context_mgr.active_persona.name
@@ -135,7 +343,7 @@ async def analyze_activity(
         else "Default",
         context_summary=context_summary,
         user_status=client_metadata.user_status,
-        suppress_notification=suppress_notification or not should_generate,
+        suppress_notification=suppress_notification or not feedback,
     )
 
 
@@ -144,28 +352,22 @@ async def get_current_context(_: str = Depends(verify_api_key)):
     """Get the current context window contents."""
     context_mgr = await get_context_manager()
 
-    return {
-        "entries": [
-            {
-                "timestamp": e.timestamp.isoformat(),
-                "window_title": e.window_title,
-                "class_name": e.class_name,
-                "media_status": e.media_status.value,
-                "user_status": e.user_status.value,
-                "vision_summary": e.vision_summary,
-            }
-            for e in context_mgr.context_window.entries
-        ],
+    # Entries are serialized once as they're added; only the small scalar
+    # part of the body is encoded here and the entries array is spliced in
+    rest = orjson.dumps({
         "capture_count": context_mgr.capture_count,
         "captures_before_feedback": context_mgr.captures_before_feedback,
         "captures_remaining": max(
             0, context_mgr.captures_before_feedback - context_mgr.capture_count
         ),
         "todos": context_mgr.get_todos_text(),
+        "feedback_queue_depth": get_ollama_service().feedback_queue_depth,
         "active_persona": context_mgr.active_persona.name
         if context_mgr.active_persona
         else None,
-    }
+    })
+    body = b'{"entries":' + context_mgr.context_window.entries_json() + b"," + rest[1:]
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/personas")
@@ -215,6 +417,33 @@ async def reload_todos(_: str = Depends(verify_api_key)):
     }
 
 
+MODEL_PROFILES_PATH = Path("/app/config/model-profiles.json")
+
+# (st_mtime_ns, profiles) from the last read of MODEL_PROFILES_PATH
+_profiles_cache: Optional[Tuple[int, dict]] = None
+
+
+async def _load_profiles() -> Optional[dict]:
+    """
+    Get the model profiles, re-reading the file only when it has changed.
+
+    Returns:
+        Profiles dict, or None if the profiles file does not exist
+    """
+    global _profiles_cache
+
+    try:
+        mtime = MODEL_PROFILES_PATH.stat().st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+    if _profiles_cache is None or _profiles_cache[0] != mtime:
+        data = orjson.loads(await asyncio.to_thread(MODEL_PROFILES_PATH.read_bytes))
+        _profiles_cache = (mtime, data.get("profiles", {}))
+
+    return _profiles_cache[1]
+
+
 @router.get("/models", response_model=ModelsResponse)
 async def get_models(_: str = Depends(verify_api_key)):
     """
@@ -223,12 +452,7 @@ async def get_models(_: str = Depends(verify_api_key)):
     ollama = get_ollama_service()
     
     # Load model profiles
-    profiles_path = Path("/app/config/model-profiles.json")
-    profiles_data = {}
-    if profiles_path.exists():
-        with open(profiles_path) as f:
-            data = json.load(f)
-            profiles_data = data.get("profiles", {})
+    profiles_data = await _load_profiles() or {}
     
     # Get installed models
     installed = await ollama.list_models()
@@ -265,26 +489,22 @@ async def switch_models(
     try:
         # If profile specified, load from config
         if request.profile:
-            profiles_path = Path("/app/config/model-profiles.json")
-            if not profiles_path.exists():
+            profiles = await _load_profiles()
+            if profiles is None:
                 raise HTTPException(
                     status_code=404,
                     detail="Model profiles configuration not found"
                 )
             
-            with open(profiles_path) as f:
-                data = json.load(f)
-                profiles = data.get("profiles", {})
-                
-                if request.profile not in profiles:
-                    raise HTTPException(
-                        status_code=404,
-                        detail=f"Profile '{request.profile}' not found"
-                    )
-                
-                profile = profiles[request.profile]
-                new_vision = profile["vision_model"]
-                new_reasoning = profile["reasoning_model"]
+            if request.profile not in profiles:
+                raise HTTPException(
+                    status_code=404,
+                    detail=f"Profile '{request.profile}' not found"
+                )
+            
+            profile = profiles[request.profile]
+            new_vision = profile["vision_model"]
+            new_reasoning = profile["reasoning_model"]
         else:
             # Use individual model specifications
             new_vision = request.vision_model
@@ -329,25 +549,21 @@ async def pull_model(model_name: str, _: str = Depends(verify_api_key)):
     Trigger pulling a model from Ollama registry.
     This is async and may take a while depending on model size.
     """
-    settings = get_settings()
+    ollama = get_ollama_service()
     
     try:
-        async with httpx.AsyncClient(timeout=600.0) as client:
-            response = await client.post(
-                f"{settings.ollama_base_url}/api/pull",
-                json={"name": model_name, "stream": False}
-            )
-            
-            if response.status_code == 200:
-                return {
-                    "success": True,
-                    "message": f"Model '{model_name}' pulled successfully"
-                }
-            else:
-                return {
-                    "success": False,
-                    "message": f"Failed to pull model: {response.text}"
-                }
+        response = await ollama.pull(model_name)
+        
+        if response.status_code == 200:
+            return {
+                "success": True,
+                "message": f"Model '{model_name}' pulled successfully"
+            }
+        else:
+            return {
+                "success": False,
+                "message": f"Failed to pull model: {response.text}"
+            }
     except Exception as e:
         logger.error(f"Error pulling model: {e}")
         raise HTTPException(
@@ -1,8 +1,10 @@
 """
 Security utilities - API key authentication.
 """
+import hashlib
 import secrets
 import logging
+from functools import lru_cache
 from fastapi import HTTPException, Security, status
 from fastapi.security import APIKeyHeader
 from app.config import get_settings
@@ -13,6 +15,12 @@ logger = logging.getLogger(__name__)
 api_key_header = APIKeyHeader(name="X-API-Key", auto_error=False)
 
 
+@lru_cache(maxsize=1)
+def _api_key_digest() -> bytes:
+    """SHA-256 of the configured API key, computed once."""
+    return hashlib.sha256(get_settings().api_key.encode()).digest()
+
+
 async def verify_api_key(api_key: str = Security(api_key_header)) -> str:
     """
     Verify the API key from request header.
@@ -34,10 +42,10 @@ async def verify_api_key(api_key: str = Security(api_key_header)) -> str:
             headers={"WWW-Authenticate": "API-Key"}
         )
     
-    settings = get_settings()
-    
-    # Use secrets.compare_digest to prevent timing attacks
-    if not secrets.compare_digest(api_key, settings.api_key):
+    # Compare fixed-length digests with secrets.compare_digest to prevent
+    # timing attacks (also independent of key length and encoding)
+    digest = hashlib.sha256(api_key.encode()).digest()
+    if not secrets.compare_digest(digest, _api_key_digest()):
         logger.warning("Invalid API key attempt")
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
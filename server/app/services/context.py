@@ -1,11 +1,12 @@
 """
 Context management service - handles sliding window and state.
 """
-import json
+import asyncio
 import logging
-import aiofiles
+import re
+import orjson
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Optional, List, Tuple
 from datetime import datetime, timezone
 
 from app.models import (
@@ -16,6 +17,9 @@ from app.config import get_settings
 
 logger = logging.getLogger(__name__)
 
+# todo.txt line: optional "x " completion marker, optional "(A) " priority, text
+_TODO_RE = re.compile(r'^(x\s+)?(?:\(([A-Z])\)\s+)?(.+)$')
+
 
 class ContextManager:
     """Manages the sliding context window and user data."""
@@ -24,15 +28,23 @@ class ContextManager:
         self.settings = get_settings()
         self.context_window = ContextWindow(max_size=self.settings.context_window_size)
         self.personas: List[Persona] = []
+        self._persona_by_name: Dict[str, Persona] = {}
         self.active_persona: Optional[Persona] = None
         self.todo_items: List[TodoItem] = []
         self.capture_count: int = 0
         self.captures_before_feedback: int = self.settings.captures_before_feedback
         
+        # Formatted todo/summary text, keyed on a version bumped whenever
+        # the underlying todos or context entries change
+        self._todos_version = 0
+        self._todos_text: Optional[Tuple[int, str]] = None
+        self._context_version = 0
+        self._context_summary: Optional[Tuple[int, str]] = None
+        
     async def initialize(self) -> None:
         """Load personas and todo items on startup."""
-        await self.load_personas()
-        await self.load_todos()
+        # Independent files - read them concurrently
+        await asyncio.gather(self.load_personas(), self.load_todos())
     
     async def load_personas(self) -> None:
         """Load personas from JSON file."""
@@ -44,16 +56,15 @@ class ContextManager:
             return
         
         try:
-            async with aiofiles.open(personas_path, 'r') as f:
-                content = await f.read()
-                data = json.loads(content)
-                
+            content = await asyncio.to_thread(personas_path.read_bytes)
+            data = orjson.loads(content)
+            
             self.personas = [Persona(**p) for p in data.get("personas", [])]
+            self._persona_by_name = {p.name: p for p in self.personas}
             
             # Set active persona (first one or default)
             default_name = data.get("default", "")
-            self.active_persona = next(
-                (p for p in self.personas if p.name == default_name),
+            self.active_persona = self._persona_by_name.get(default_name) or (
                 self.personas[0] if self.personas else None
             )
             
@@ -76,6 +87,7 @@ class ContextManager:
             prompt_template="You are a helpful, friendly productivity assistant. Your goal is to help the user stay focused and productive without being intrusive."
         )
         self.personas = [self.active_persona]
+        self._persona_by_name = {self.active_persona.name: self.active_persona}
     
     async def load_todos(self) -> None:
         """Load todos from todo.txt file (todo.txt format)."""
@@ -83,54 +95,59 @@ class ContextManager:
         
         if not todo_path.exists():
             logger.warning(f"Todo file not found: {todo_path}")
-            self.todo_items = []
+            self._set_todos([])
             return
         
         try:
-            async with aiofiles.open(todo_path, 'r') as f:
-                content = await f.read()
+            content = await asyncio.to_thread(todo_path.read_text, encoding="utf-8")
             
-            self.todo_items = []
-            for line in content.strip().split('\n'):
-                line = line.strip()
-                if not line:
+            todo_items = []
+            for line in content.splitlines():
+                m = _TODO_RE.match(line.strip())
+                if not m:
                     continue
                 
-                completed = line.startswith('x ')
-                if completed:
-                    line = line[2:]
-                
-                # Check for priority (A), (B), etc.
-                priority = None
-                if line.startswith('(') and len(line) > 2 and line[2] == ')':
-                    priority = line[1]
-                    line = line[4:].strip()
-                
-                self.todo_items.append(TodoItem(
-                    text=line,
-                    completed=completed,
-                    priority=priority
+                todo_items.append(TodoItem(
+                    text=m.group(3),
+                    completed=m.group(1) is not None,
+                    priority=m.group(2)
                 ))
             
+            self._set_todos(todo_items)
             logger.info(f"Loaded {len(self.todo_items)} todo items")
             
         except Exception as e:
             logger.error(f"Error loading todos: {e}")
-            self.todo_items = []
+            self._set_todos([])
+    
+    def _set_todos(self, todo_items: List[TodoItem]) -> None:
+        """
+        Replace the todo items and invalidate the cached todo text.
+
+        The version is bumped only once the new items are in place, so text
+        formatted while a reload was still reading the file isn't kept.
+        """
+        self.todo_items = todo_items
+        self._todos_version += 1
     
     def get_todos_text(self) -> str:
         """Get formatted todo list as text."""
-        if not self.todo_items:
-            return "No todos defined."
+        if self._todos_text is not None and self._todos_text[0] == self._todos_version:
+            return self._todos_text[1]
         
-        lines = []
-        for item in self.todo_items:
-            if item.completed:
-                continue
-            prefix = f"({item.priority}) " if item.priority else ""
-            lines.append(f"- {prefix}{item.text}")
+        if not self.todo_items:
+            text = "No todos defined."
+        else:
+            lines = []
+            for item in self.todo_items:
+                if item.completed:
+                    continue
+                prefix = f"({item.priority}) " if item.priority else ""
+                lines.append(f"- {prefix}{item.text}")
+            text = "\n".join(lines) if lines else "All todos completed!"
         
-        return "\n".join(lines) if lines else "All todos completed!"
+        self._todos_text = (self._todos_version, text)
+        return text
     
     def add_context_entry(
         self,
@@ -150,6 +167,7 @@ class ContextManager:
             vision_summary=vision_summary
         )
         self.context_window.add_entry(entry)
+        self._context_version += 1
         self.capture_count += 1
         logger.debug(f"Added context entry: {window_title} (capture {self.capture_count})")
     
@@ -163,7 +181,9 @@ class ContextManager:
     
     def get_context_summary(self) -> str:
         """Get summary of recent context."""
-        return self.context_window.get_summary()
+        if self._context_summary is None or self._context_summary[0] != self._context_version:
+            self._context_summary = (self._context_version, self.context_window.get_summary())
+        return self._context_summary[1]
     
     def get_persona_prompt(self) -> str:
         """Get the active persona's prompt template."""
@@ -173,7 +193,7 @@ class ContextManager:
     
     def set_active_persona(self, name: str) -> bool:
         """Set active persona by name."""
-        persona = next((p for p in self.personas if p.name == name), None)
+        persona = self._persona_by_name.get(name)
         if persona:
             self.active_persona = persona
             logger.info(f"Switched to persona: {name}")
@@ -187,12 +207,17 @@ class ContextManager:
 
 # Singleton instance
 _context_manager: Optional[ContextManager] = None
+_context_manager_lock = asyncio.Lock()
 
 
 async def get_context_manager() -> ContextManager:
     """Get or create context manager instance."""
     global _context_manager
     if _context_manager is None:
-        _context_manager = ContextManager()
-        await _context_manager.initialize()
+        # Concurrent first requests must not initialize it twice
+        async with _context_manager_lock:
+            if _context_manager is None:
+                context_mgr = ContextManager()
+                await context_mgr.initialize()
+                _context_manager = context_mgr
     return _context_manager
@@ -2,49 +2,463 @@
 Ollama integration service for vision and reasoning.
 """
 
+import asyncio
+import hashlib
 import httpx
 import logging
-from typing import Optional, List
+import random
+import re
+import time
+from collections import OrderedDict, deque
+from functools import lru_cache
+from typing import Deque, Dict, Optional, List, Set, Tuple
+
+import numpy as np
+import orjson
 from app.config import get_settings
 
+try:
+    # HTTP/2 support for httpx (optional) - lets concurrent Ollama calls share
+    # one connection when Ollama sits behind a TLS proxy. Plain http:// URLs
+    # keep using HTTP/1.1 keep-alive connections from the pool.
+    import h2  # noqa: F401
+    _HTTP2 = True
+except ImportError:  # h2 not installed
+    _HTTP2 = False
+
 logger = logging.getLogger(__name__)
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Installed models rarely change; reuse the last /api/tags listing this long
+_MODELS_CACHE_TTL = 5.0
+
+# Prompt templates, filled in with str.format
+_VISION_PROMPT = """
+        Describe the CONTENT inside the active {context}.
+        - Are there lines of code, a video, a chat, a document, or what?
+        - Describe the visual mood: is it static, dynamic, colorful, dark, etc.?
+        - Does it look like work or leisure?
+        Describe in 1-2 sentences, be concise and specific.
+        """
+
+_SYSTEM_PROMPT = """
+                {persona_prompt}
+                
+                OPERATIONAL RULES:
+                1. You have the exact App Name:{app_name} and a Visual Description (see below). Use both.
+                2. IF App Name says "Spotify" and Visual says "Code", they are just listening to music while working. That is fine.
+                3. Keep it under 2 sentences.
+                """
+
+_USER_PROMPT = """
+        --- REAL-TIME METADATA ---
+        VISUAL CONTENT: {vision_summary}
+        USER STATUS: {user_status}
+        
+        --- GOALS (IF ANY) ---
+        TODO LIST: 
+        {todo_list}
+        
+        --- CONTEXT ---
+        HISTORY: {context_summary}
+        
+        RESPONSE (Should be In Character):
+        """
+
+# Generate attempts, and the statuses worth retrying (e.g. model still loading)
+_GENERATE_ATTEMPTS = 3
+_RETRY_STATUSES = frozenset({500, 502, 503, 504})
+
+# Feedback requests waiting for a background worker; the oldest are
+# dropped beyond this, since feedback on a newer screen supersedes them
+_FEEDBACK_QUEUE_SIZE = 8
+
+# End of a sentence: terminal punctuation followed by whitespace
+_SENTENCE_END_RE = re.compile(r"[.!?](?=\s)")
+
+
+def _clip(text: str, limit: int, keep_end: bool = False) -> str:
+    """
+    Trim text to at most `limit` characters, cutting on a line boundary.
+
+    Keeps the start of the text, or the end with keep_end (e.g. for a
+    chronological history, where the latest lines matter most).
+    """
+    if limit <= 0 or len(text) <= limit:
+        return text
+    if keep_end:
+        cut = text[-limit:]
+        nl = cut.find("\n")
+        return cut[nl + 1:] if nl != -1 else cut
+    cut = text[:limit]
+    nl = cut.rfind("\n")
+    return cut[:nl] if nl != -1 else cut
+
+
+class _ResponseCache:
+    """
+    LRU cache of Ollama responses with a time-to-live.
+
+    Keyed on a digest of everything that goes into a generate request
+    (model, prompts, image), so only exact repeats are served from it.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[bytes, Tuple[float, str]]" = OrderedDict()
+
+    @staticmethod
+    def key(*parts: str) -> bytes:
+        h = hashlib.blake2b(digest_size=16)
+        for part in parts:
+            h.update(part.encode())
+            h.update(b"\0")
+        return h.digest()
+
+    def get(self, key: bytes) -> Optional[str]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key: bytes, value: str) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+
+class _SemanticCache:
+    """
+    Recent feedbacks indexed by an embedding of the screen they were made for.
+
+    A feedback is reused when a new screen embeds within the similarity
+    threshold of a previous one in the same scope (model, persona, todos).
+    """
+
+    def __init__(self, maxsize: int, threshold: float):
+        self.threshold = threshold
+        self._entries: Deque[Tuple[bytes, np.ndarray, str]] = deque(maxlen=maxsize)
+
+    def get(self, scope: bytes, vector: np.ndarray) -> Optional[str]:
+        candidates = [(v, f) for s, v, f in self._entries if s == scope]
+        if not candidates:
+            return None
+        # Vectors are unit length, so the dot product is the cosine similarity
+        scores = np.stack([v for v, _ in candidates]) @ vector
+        best = int(scores.argmax())
+        return candidates[best][1] if scores[best] >= self.threshold else None
+
+    def put(self, scope: bytes, vector: np.ndarray, feedback: str) -> None:
+        if self._entries.maxlen:
+            self._entries.append((scope, vector, feedback))
+
 
 class OllamaService:
-    """Service for interacting with Ollama API."""
+    """
+    Service for interacting with Ollama API.
+
+    Concurrent requests only run in parallel on Ollama itself when it is
+    started with OLLAMA_NUM_PARALLEL > 1 (requests per loaded model) and,
+    for vision and reasoning to both stay loaded, OLLAMA_MAX_LOADED_MODELS
+    >= 2. Keep OLLAMA_MAX_INFLIGHT on this server in line with Ollama's
+    OLLAMA_NUM_PARALLEL.
+    """
 
     def __init__(self):
         self.settings = get_settings()
         self.base_url = self.settings.ollama_base_url
         self.vision_model = self.settings.vision_model
         self.reasoning_model = self.settings.reasoning_model
+        self.embedding_model = self.settings.embedding_model
         self.timeout = self.settings.request_timeout
-
-    def _model_exists(self, model: str, available: List[str]) -> bool:
-        """Check if model exists, handling tag variations like moondream vs moondream:latest."""
-        # Exact match
-        if model in available:
-            return True
-        
-        model_base = model.split(':')[0]
-        model_tag = model.split(':')[1] if ':' in model else None
+        self.keep_alive = self.settings.model_keep_alive
+        self.reasoning_num_ctx = self.settings.reasoning_num_ctx
+        self._cache = _ResponseCache(
+            self.settings.response_cache_size, self.settings.response_cache_ttl
+        )
+        self._semantic_cache = _SemanticCache(
+            self.settings.semantic_cache_size, self.settings.semantic_cache_threshold
+        )
         
+        # Shared connection pool, created lazily on the running event loop
+        self._client: Optional[httpx.AsyncClient] = None
+        self._client_loop: Optional[asyncio.AbstractEventLoop] = None
+
+        # Back-pressure: bounds generations in flight on Ollama at once
+        self._inflight = asyncio.Semaphore(self.settings.ollama_max_inflight)
+
+        # Background feedback generation (see start_feedback_workers)
+        self._feedback_queue: Optional[asyncio.Queue] = None
+        self._feedback_workers: List[asyncio.Task] = []
+        self._ready_feedback: Optional[str] = None
+
+        # (monotonic timestamp, names) of the last successful model listing
+        self._models_cache: Optional[Tuple[float, List[str]]] = None
+
+    def _http(self) -> httpx.AsyncClient:
+        """
+        Get the shared Ollama client.
+
+        A client is bound to the event loop it first ran on, so a new one
+        is created if the old one was closed or belongs to a loop that is
+        gone (e.g. after a test client or server restart).
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._client.is_closed or self._client_loop is not loop:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.timeout, connect=5.0),
+                http2=_HTTP2,
+                limits=httpx.Limits(
+                    max_connections=100,
+                    max_keepalive_connections=20,
+                    keepalive_expiry=30.0,
+                ),
+            )
+            self._client_loop = loop
+        return self._client
+
+    async def _post(self, path: str, json: dict, **kwargs) -> httpx.Response:
+        """POST a JSON body to Ollama, encoded with orjson rather than stdlib json."""
+        return await self._http().post(
+            path, content=orjson.dumps(json), headers=_JSON_HEADERS, **kwargs
+        )
+
+    async def _generate(
+        self, payload: dict, deadline: Optional[float], max_sentences: int = 2
+    ) -> str:
+        """
+        Run a streamed /api/generate, stopping after `max_sentences` sentences.
+
+        Both prompts ask for at most two sentences, so once they are in the
+        stream is closed, which also makes Ollama stop generating. Transient
+        failures (connection errors, 5xx while a model loads) are retried
+        with jittered exponential backoff while the deadline allows. Read
+        timeouts are only retried under a deadline; without one each attempt
+        could wait the full request_timeout.
+
+        Returns:
+            The generated text
+
+        Raises:
+            httpx.HTTPStatusError: Ollama answered with an error status
+        """
+        for attempt in range(_GENERATE_ATTEMPTS):
+            try:
+                return await self._generate_once(payload, deadline, max_sentences)
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in _RETRY_STATUSES:
+                    raise
+                error, reason = e, f"status {e.response.status_code}"
+            except httpx.ReadTimeout as e:
+                if deadline is None:
+                    raise
+                error, reason = e, f"{type(e).__name__}: {e}"
+            except (httpx.ConnectError, httpx.RemoteProtocolError) as e:
+                error, reason = e, f"{type(e).__name__}: {e}"
+
+            delay = min(2 ** attempt + random.random() * 0.25, 10.0)
+            if attempt == _GENERATE_ATTEMPTS - 1 or (
+                deadline is not None and time.monotonic() + delay >= deadline
+            ):
+                break
+            logger.warning(
+                f"Ollama generate failed ({reason}), retrying in {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
+
+        raise error
+
+    async def _generate_once(
+        self, payload: dict, deadline: Optional[float], max_sentences: int
+    ) -> str:
+        """
+        Make one generate attempt.
+
+        At most `ollama_max_inflight` generations run at once; the rest wait
+        here for a slot.
+        """
+        if self._inflight.locked():
+            logger.debug("Ollama at max inflight requests, waiting for a slot")
+        async with self._inflight:
+            # The wait for a slot may have used up the deadline
+            timeout = self._deadline_timeout(deadline)
+            if timeout is None:
+                raise asyncio.TimeoutError("deadline passed while waiting for Ollama")
+            return await self._stream_generate(payload, timeout, deadline, max_sentences)
+
+    async def _stream_generate(
+        self,
+        payload: dict,
+        timeout: httpx.Timeout,
+        deadline: Optional[float],
+        max_sentences: int,
+    ) -> str:
+        """
+        Stream one /api/generate request (see _generate).
+
+        The read timeout only bounds the gap between chunks, so the deadline
+        is also checked per chunk to cap total generation time.
+
+        Leaving the stream early closes the response without draining it,
+        which drops that connection from the pool instead of reusing it -
+        the price of stopping Ollama's generation there.
+        """
+        async with self._http().stream(
+            "POST",
+            "/api/generate",
+            content=orjson.dumps({**payload, "stream": True}),
+            headers=_JSON_HEADERS,
+            timeout=timeout,
+        ) as response:
+            if response.is_error:
+                await response.aread()
+                response.raise_for_status()
+
+            text = ""
+            async for line in response.aiter_lines():
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise asyncio.TimeoutError("deadline passed while generating")
+                if not line:
+                    continue
+                chunk = orjson.loads(line)
+                if "error" in chunk:
+                    raise RuntimeError(chunk["error"])
+                text += chunk.get("response", "")
+                if chunk.get("done"):
+                    break
+                ends = list(_SENTENCE_END_RE.finditer(text))
+                if len(ends) >= max_sentences:
+                    text = text[:ends[max_sentences - 1].end()]
+                    break
+            return text
+
+    def start_feedback_workers(self, count: int) -> None:
+        """
+        Start background workers that run queued generate_feedback calls.
+
+        Captures then only queue their feedback request (submit_feedback)
+        instead of waiting on the reasoning model, and finished feedback
+        is picked up with take_feedback.
+        """
+        self._feedback_queue = asyncio.Queue(maxsize=_FEEDBACK_QUEUE_SIZE)
+        self._feedback_workers = [
+            asyncio.create_task(self._feedback_worker()) for _ in range(count)
+        ]
+        logger.info(f"Started {count} background feedback workers")
+
+    async def _feedback_worker(self) -> None:
+        while True:
+            request = await self._feedback_queue.get()
+            try:
+                feedback = await self.generate_feedback(**request)
+                if feedback:
+                    self._ready_feedback = feedback
+            finally:
+                self._feedback_queue.task_done()
+
+    def submit_feedback(self, **request) -> None:
+        """
+        Queue a generate_feedback call (same arguments) for the workers.
+
+        If the queue is full the oldest request is dropped: the newest
+        screen is the one worth commenting on.
+        """
+        if self._feedback_queue.full():
+            self._feedback_queue.get_nowait()
+            self._feedback_queue.task_done()
+            logger.warning("Feedback queue full, dropped the oldest request")
+        self._feedback_queue.put_nowait(request)
+        logger.debug(f"Feedback queued ({self.feedback_queue_depth} waiting)")
+
+    def take_feedback(self) -> Optional[str]:
+        """Get the latest finished background feedback, if any (only once)."""
+        feedback, self._ready_feedback = self._ready_feedback, None
+        return feedback
+
+    @property
+    def feedback_queue_depth(self) -> int:
+        """Number of feedback requests waiting for a worker."""
+        return self._feedback_queue.qsize() if self._feedback_queue else 0
+
+    async def aclose(self) -> None:
+        """Stop feedback workers and close the shared client (called on application shutdown)."""
+        for worker in self._feedback_workers:
+            worker.cancel()
+        await asyncio.gather(*self._feedback_workers, return_exceptions=True)
+        self._feedback_workers = []
+        if self._client is not None and not self._client.is_closed:
+            await self._client.aclose()
+        self._client = None
+
+    async def warmup(self) -> None:
+        """
+        Open a pooled connection and load both models ahead of the first capture.
+
+        Each model gets a one-token generation, so the first real request
+        only pays for inference rather than a cold model load.
+        """
+        if not await self.check_connection():
+            logger.warning("Skipping model warmup: Ollama not reachable")
+            return
+
+        async def load(model: str) -> None:
+            try:
+                response = await self._post(
+                    "/api/generate",
+                    json={
+                        "model": model,
+                        "prompt": "hi",
+                        "stream": False,
+                        "keep_alive": self.keep_alive,
+                        # Load with the options real requests use, or the
+                        # first of them would reload the model
+                        "options": self._model_options(model, num_predict=1),
+                    },
+                )
+                if response.status_code == 200:
+                    logger.info(f"Warmed up model: {model}")
+                else:
+                    logger.warning(f"Warmup of {model} failed: {response.status_code}")
+            except Exception as e:
+                logger.warning(f"Warmup of {model} failed: {e}")
+
+        await asyncio.gather(*(load(m) for m in {self.vision_model, self.reasoning_model}))
+
+    @staticmethod
+    def _split_model(name: str) -> Tuple[str, Optional[str]]:
+        """Split "base:tag" into (base, tag), with tag None if absent."""
+        base, _, tag = name.partition(':')
+        return base, tag or None
+
+    @classmethod
+    def _model_table(cls, available: List[str]) -> Dict[str, Set[Optional[str]]]:
+        """Index installed model names as base name -> set of tags."""
+        table: Dict[str, Set[Optional[str]]] = {}
         for avail in available:
-            avail_base = avail.split(':')[0]
-            avail_tag = avail.split(':')[1] if ':' in avail else None
-            
-            if model_base != avail_base:
-                continue
-            
-            # Same base name: only match if one side has no tag
-            # (e.g., "moondream" matches "moondream:latest")
-            # Do NOT match different tags (e.g., "llama3.2:3b" vs "llama3.2:1b")
-            if model_tag is None or avail_tag is None:
-                return True
-            if model_tag == avail_tag:
-                return True
-        
-        return False
+            base, tag = cls._split_model(avail)
+            table.setdefault(base, set()).add(tag)
+        return table
+
+    def _model_exists(self, model: str, table: Dict[str, Set[Optional[str]]]) -> bool:
+        """Check if model exists, handling tag variations like moondream vs moondream:latest."""
+        base, tag = self._split_model(model)
+        tags = table.get(base)
+        if not tags:
+            return False
+        # Same base name: only match if one side has no tag
+        # (e.g., "moondream" matches "moondream:latest")
+        # Do NOT match different tags (e.g., "llama3.2:3b" vs "llama3.2:1b")
+        return tag is None or None in tags or tag in tags
 
     async def reload_models(
         self,
@@ -65,15 +479,16 @@ class OllamaService:
             # Validate models exist
             available = await self.list_models()
             logger.info(f"Available models: {available}")
+            table = self._model_table(available)
             
             if vision_model:
-                if not self._model_exists(vision_model, available):
+                if not self._model_exists(vision_model, table):
                     logger.warning(f"Vision model '{vision_model}' not installed")
                     logger.info(f"Available models: {', '.join(available)}")
                     return False
             
             if reasoning_model:
-                if not self._model_exists(reasoning_model, available):
+                if not self._model_exists(reasoning_model, table):
                     logger.warning(f"Reasoning model '{reasoning_model}' not installed")
                     logger.info(f"Available models: {', '.join(available)}")
                     return False
@@ -95,73 +510,154 @@ class OllamaService:
             logger.error(f"Error reloading models: {e}")
             return False
 
+    def _model_options(self, model: str, **options) -> dict:
+        """
+        Get generate options for a model, adding its num_ctx if configured.
+
+        num_ctx is fixed per model rather than sized per prompt: Ollama
+        reloads a model whenever it is asked for a different context size.
+        """
+        if model == self.reasoning_model and self.reasoning_num_ctx > 0:
+            options["num_ctx"] = self.reasoning_num_ctx
+        return options
+
     async def check_connection(self) -> bool:
         """Check if Ollama is reachable."""
         try:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{self.base_url}/api/tags")
-                return response.status_code == 200
+            response = await self._http().get("/api/tags", timeout=5.0)
+            return response.status_code == 200
         except Exception as e:
             logger.error(f"Ollama connection check failed: {e}")
             return False
 
     async def list_models(self) -> List[str]:
         """List available models in Ollama."""
+        if self._models_cache and time.monotonic() - self._models_cache[0] < _MODELS_CACHE_TTL:
+            return self._models_cache[1]
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(f"{self.base_url}/api/tags")
-                if response.status_code == 200:
-                    data = response.json()
-                    return [model["name"] for model in data.get("models", [])]
+            response = await self._http().get("/api/tags", timeout=10.0)
+            if response.status_code == 200:
+                data = orjson.loads(response.content)
+                models = [model["name"] for model in data.get("models", [])]
+                self._models_cache = (time.monotonic(), models)
+                return models
         except Exception as e:
             logger.error(f"Failed to list models: {e}")
         return []
 
+    async def pull(self, name: str) -> httpx.Response:
+        """
+        Pull a model from the Ollama registry (blocks until done).
+
+        Args:
+            name: Model name, e.g. "moondream:latest"
+
+        Returns:
+            Ollama's response to the non-streaming pull request
+        """
+        try:
+            return await self._post(
+                "/api/pull",
+                json={"name": name, "stream": False},
+                timeout=httpx.Timeout(600.0, connect=5.0),
+            )
+        finally:
+            # The pulled model must show up in the next listing
+            self._models_cache = None
+
+    def _deadline_timeout(self, deadline: Optional[float]) -> Optional[httpx.Timeout]:
+        """
+        Get the timeout for a call that must finish by `deadline`.
+
+        Returns:
+            The timeout with its read limit capped at the time left, or
+            None if the deadline has already passed
+        """
+        if deadline is None:
+            return httpx.Timeout(self.timeout, connect=5.0)
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        return httpx.Timeout(self.timeout, connect=5.0, read=max(0.1, remaining))
+
+    async def _embed(self, text: str) -> Optional[np.ndarray]:
+        """Embed text with the embedding model, as a unit-length vector."""
+        try:
+            response = await self._post(
+                "/api/embed",
+                json={
+                    "model": self.embedding_model,
+                    "input": text,
+                    "keep_alive": self.keep_alive,
+                },
+            )
+            if response.status_code != 200:
+                logger.error(f"Embedding failed: {response.status_code}")
+                return None
+            vector = np.asarray(orjson.loads(response.content)["embeddings"][0], dtype=np.float32)
+            norm = np.linalg.norm(vector)
+            return vector / norm if norm else None
+        except Exception as e:
+            logger.error(f"Embedding error: {e}")
+            return None
+
     async def analyze_image(
-        self, image_base64: str, context: str = ""
+        self,
+        image_base64: str,
+        context: str = "",
+        deadline: Optional[float] = None,
     ) -> Optional[str]:
         """
         Analyze an image using the vision model (moondream).
 
         Args:
-            image_base64: Base64 encoded image
+            image_base64: Base64 encoded image (ASCII str), sent to Ollama as is
             context: Additional context about what to look for
+            deadline: time.monotonic() after which the result is no longer
+                wanted; the call is skipped or aborted past it
 
         Returns:
             Description of the image content
         """
-    
-        prompt = f"""
-        Describe the CONTENT inside the active {context}.
-        - Are there lines of code, a video, a chat, a document, or what?
-        - Describe the visual mood: is it static, dynamic, colorful, dark, etc.?
-        - Does it look like work or leisure?
-        Describe in 1-2 sentences, be concise and specific.
-        """
+        prompt = _VISION_PROMPT.format(context=context)
+
+        cache_key = self._cache.key(self.vision_model, prompt, image_base64)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            logger.debug("Vision analysis served from cache")
+            return cached
+
+        if self._deadline_timeout(deadline) is None:
+            logger.warning("Vision analysis dropped: deadline passed")
+            return None
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.base_url}/api/generate",
-                    json={
-                        "model": self.vision_model,
-                        "prompt": prompt,
-                        "images": [image_base64],
-                        "stream": False,
-                        "options": {
-                            "temperature": 0.1,  # Lower = more focused
-                            "num_predict": 100,
-                        },
-                    },
-                )
+            text = await self._generate(
+                {
+                    "model": self.vision_model,
+                    "prompt": prompt,
+                    "images": [image_base64],
+                    "keep_alive": self.keep_alive,
+                    # Same num_ctx as reasoning if it's the same model, so
+                    # alternating calls don't make Ollama reload it
+                    "options": self._model_options(
+                        self.vision_model,
+                        temperature=0.1,  # Lower = more focused
+                        num_predict=100,
+                    ),
+                },
+                deadline,
+            )
 
-                if response.status_code == 200:
-                    result = response.json()
-                    return result.get("response", "").strip()
-                else:
-                    logger.error(f"Vision analysis failed: {response.status_code}")
-                    return None
+            summary = text.strip()
+            self._cache.put(cache_key, summary)
+            return summary
 
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f"Vision analysis failed: {e.response.status_code} - {e.response.text[:200]}"
+            )
+            return None
         except Exception as e:
             logger.error(f"Image analysis error: {e}")
             return None
@@ -174,6 +670,7 @@ class OllamaService:
         persona_prompt: str,
         user_status: str,
         app_name: str = "",
+        deadline: Optional[float] = None,
     ) -> Optional[str]:
         """
         Generate contextual feedback using the reasoning model.
@@ -184,78 +681,84 @@ class OllamaService:
             todo_list: User's current todo items
             persona_prompt: The AI persona's prompt template
             user_status: Current user status (active, in_meeting, etc.)
+            deadline: time.monotonic() after which the result is no longer
+                wanted; the call is skipped or aborted past it
 
         Returns:
             Generated feedback text
         """
 
-        system_prompt = f"""
-                {persona_prompt}
-                
-                OPERATIONAL RULES:
-                1. You have the exact App Name:{app_name} and a Visual Description (see below). Use both.
-                2. IF App Name says "Spotify" and Visual says "Code", they are just listening to music while working. That is fine.
-                3. Keep it under 2 sentences.
-                """
+        system_prompt = _SYSTEM_PROMPT.format(persona_prompt=persona_prompt, app_name=app_name)
 
-        user_prompt = f"""
-        --- REAL-TIME METADATA ---
-        VISUAL CONTENT: {vision_summary}
-        USER STATUS: {user_status}
-        
-        --- GOALS (IF ANY) ---
-        TODO LIST: 
-        {todo_list if todo_list else ""}
-        
-        --- CONTEXT ---
-        HISTORY: {context_summary}
-        
-        RESPONSE (Should be In Character):
-        """
+        # Bound the variable sections so the prompt fits num_ctx and prefill
+        # stays short no matter how long the history or todo list get
+        max_chars = self.settings.prompt_section_max_chars
+        user_prompt = _USER_PROMPT.format(
+            vision_summary=vision_summary,
+            user_status=user_status,
+            todo_list=_clip(todo_list or "", max_chars),
+            context_summary=_clip(context_summary, max_chars, keep_end=True),
+        )
+
+        cache_key = self._cache.key(self.reasoning_model, system_prompt, user_prompt)
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            logger.info("Feedback served from cache")
+            return cached
+
+        # Near-duplicate screens get the feedback already given for them
+        semantic_entry = None
+        if self.embedding_model and vision_summary:
+            vector = await self._embed(f"{vision_summary}|{app_name}|{user_status}")
+            if vector is not None:
+                scope = self._cache.key(self.reasoning_model, persona_prompt, todo_list)
+                cached = self._semantic_cache.get(scope, vector)
+                if cached is not None:
+                    logger.info("Feedback served from semantic cache")
+                    return cached
+                semantic_entry = (scope, vector)
+
+        if self._deadline_timeout(deadline) is None:
+            logger.warning("Feedback generation dropped: deadline passed")
+            return None
 
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                logger.info(f"Generating feedback with {self.reasoning_model}...")
-                logger.debug(
-                    f"Vision summary: {vision_summary[:100] if vision_summary else 'None'}..."
-                )
+            logger.info(f"Generating feedback with {self.reasoning_model}...")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Vision summary: %s...", (vision_summary or "None")[:100])
 
-                response = await client.post(
-                    f"{self.base_url}/api/generate",
-                    json={
-                        "model": self.reasoning_model,
-                        "prompt": user_prompt,
-                        "system": system_prompt,
-                        "stream": False,
-                        "options": {"temperature": 0.7, "num_predict": 100},
-                    },
-                )
+            text = await self._generate(
+                {
+                    "model": self.reasoning_model,
+                    "prompt": user_prompt,
+                    "system": system_prompt,
+                    "keep_alive": self.keep_alive,
+                    "options": self._model_options(
+                        self.reasoning_model, temperature=0.7, num_predict=100
+                    ),
+                },
+                deadline,
+            )
 
-                if response.status_code == 200:
-                    result = response.json()
-                    feedback = result.get("response", "").strip()
-                    logger.info(
-                        f"Feedback generated: {feedback[:80] if feedback else 'EMPTY'}..."
-                    )
-                    return feedback if feedback else None
-                else:
-                    logger.error(
-                        f"Feedback generation failed: {response.status_code} - {response.text}"
-                    )
-                    return None
+            feedback = text.strip()
+            logger.info("Feedback generated: %s...", feedback[:80] if feedback else "EMPTY")
+            if feedback:
+                self._cache.put(cache_key, feedback)
+                if semantic_entry:
+                    self._semantic_cache.put(*semantic_entry, feedback)
+            return feedback if feedback else None
 
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                f"Feedback generation failed: {e.response.status_code} - {e.response.text[:200]}"
+            )
+            return None
         except Exception as e:
             logger.error(f"Feedback generation error: {e}")
             return None
 
 
-# Singleton instance
-_ollama_service: Optional[OllamaService] = None
-
-
+@lru_cache()
 def get_ollama_service() -> OllamaService:
-    """Get or create Ollama service instance."""
-    global _ollama_service
-    if _ollama_service is None:
-        _ollama_service = OllamaService()
-    return _ollama_service
+    """Get the shared Ollama service instance (one connection pool per process)."""
+    return OllamaService()
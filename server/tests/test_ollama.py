@@ -0,0 +1,50 @@
+"""Tests for the Ollama service retry policy."""
+
+import os
+import time
+import unittest
+from unittest import mock
+
+import httpx
+
+os.environ.setdefault("API_KEY", "test")
+
+from app.services.ollama import OllamaService  # noqa: E402
+
+
+class GenerateRetryTests(unittest.IsolatedAsyncioTestCase):
+    """Retries in OllamaService._generate."""
+
+    def setUp(self):
+        self.service = OllamaService()
+        self.attempts = 0
+
+    def _failing(self, error: Exception):
+        async def generate_once(payload, deadline, max_sentences):
+            self.attempts += 1
+            raise error
+        return generate_once
+
+    async def test_read_timeout_without_deadline_is_not_retried(self):
+        self.service._generate_once = self._failing(httpx.ReadTimeout("slow model"))
+        with self.assertRaises(httpx.ReadTimeout):
+            await self.service._generate({}, deadline=None)
+        self.assertEqual(self.attempts, 1)
+
+    async def test_read_timeout_with_deadline_is_retried(self):
+        self.service._generate_once = self._failing(httpx.ReadTimeout("slow model"))
+        with mock.patch("app.services.ollama.asyncio.sleep", new=mock.AsyncMock()):
+            with self.assertRaises(httpx.ReadTimeout):
+                await self.service._generate({}, deadline=time.monotonic() + 60)
+        self.assertEqual(self.attempts, 3)
+
+    async def test_connect_error_without_deadline_is_retried(self):
+        self.service._generate_once = self._failing(httpx.ConnectError("refused"))
+        with mock.patch("app.services.ollama.asyncio.sleep", new=mock.AsyncMock()):
+            with self.assertRaises(httpx.ConnectError):
+                await self.service._generate({}, deadline=None)
+        self.assertEqual(self.attempts, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()